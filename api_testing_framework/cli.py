@@ -8,10 +8,8 @@ import sys
 from pathlib import Path
 from typing import Optional
 
-from .config import ConfigManager
-from .parser import OpenAPIParser
-from .generator import TestGenerator
-from .executor import TestExecutor
+# Heavy modules (yaml, jsonschema, requests, jinja2) are imported inside each
+# command so that `batman --help` and friends only pay for click.
 
 
 @click.group()
@@ -30,29 +28,19 @@ def main():
 @click.option('--template', '-t', help='Template to use for initialization')
 def init(project_name: str, template: Optional[str] = None):
     """Initialize a new BATMAN test project."""
+    from .config import ConfigManager
+    
     try:
         project_path = Path(project_name)
-        if project_path.exists():
+        try:
+            project_path.mkdir(parents=True)
+        except FileExistsError:
             click.echo(f"Error: Directory '{project_name}' already exists", err=True)
             sys.exit(1)
         
-        project_path.mkdir(parents=True)
-        
         # Create project structure
-        config_dir = project_path / "config"
-        config_dir.mkdir()
-        
-        environments_dir = config_dir / "environments"
-        environments_dir.mkdir()
-        
-        templates_dir = config_dir / "templates"
-        templates_dir.mkdir()
-        
-        generated_dir = project_path / "generated"
-        generated_dir.mkdir()
-        
-        reports_dir = project_path / "reports"
-        reports_dir.mkdir()
+        for subdir in ("config/environments", "config/templates", "generated", "reports"):
+            (project_path / subdir).mkdir(parents=True, exist_ok=True)
         
         # Create default configuration
         config_manager = ConfigManager()
@@ -72,10 +60,14 @@ def init(project_name: str, template: Optional[str] = None):
 @click.option('--env', '-e', help='Environment to use')
 def generate(config: Optional[str] = None, env: Optional[str] = None):
     """Generate BATS tests from OpenAPI specification."""
+    from .config import ConfigManager
+    from .parser import OpenAPIParser
+    from .generator import TestGenerator
+    
     try:
         # Load configuration
         config_manager = ConfigManager()
-        config_data = config_manager.load_config(config, env)
+        config_data = config_manager.load_config_cached(config, env)
         
         # Parse OpenAPI specification
         parser = OpenAPIParser()
@@ -101,10 +93,13 @@ def generate(config: Optional[str] = None, env: Optional[str] = None):
 def run(config: Optional[str] = None, env: Optional[str] = None, 
         docker: bool = False, parallel: bool = False, verbose: bool = False):
     """Run generated BATS tests."""
+    from .config import ConfigManager
+    from .executor import TestExecutor
+    
     try:
         # Load configuration
         config_manager = ConfigManager()
-        config_data = config_manager.load_config(config, env)
+        config_data = config_manager.load_config_cached(config, env)
         
         # Execute tests
         executor = TestExecutor()
@@ -126,10 +121,13 @@ def run(config: Optional[str] = None, env: Optional[str] = None,
 @click.option('--config', '-c', help='Path to configuration file')
 def validate(config: Optional[str] = None):
     """Validate configuration and OpenAPI specification."""
+    from .config import ConfigManager
+    from .parser import OpenAPIParser
+    
     try:
         # Load configuration
         config_manager = ConfigManager()
-        config_data = config_manager.load_config(config)
+        config_data = config_manager.load_config_cached(config)
         
         # Validate configuration
         config_manager.validate_config(config_data)
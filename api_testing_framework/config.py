@@ -2,188 +2,391 @@
 Configuration management for BATMAN API Testing Framework.
 """
 
+import functools
+import hashlib
 import os
+import pickle
+import re
+import time
 import yaml
 from pathlib import Path
-from typing import Dict, Any, Optional
-import jsonschema
-from jsonschema import validate
+from typing import Any, Callable, Dict, List, Optional, TYPE_CHECKING
+import fastjsonschema
 
+if TYPE_CHECKING:
+    import requests
 
-class ConfigManager:
-    """Manages configuration loading, validation, and environment handling."""
-    
-    def __init__(self):
-        self.config_schema = self._load_config_schema()
-    
-    def _load_config_schema(self) -> Dict[str, Any]:
-        """Load the configuration schema for validation."""
-        return {
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader  # type: ignore[assignment]
+
+
+_ENV_VAR_RE = re.compile(r'\$\{([^}]+)\}')
+
+_CONFIG_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "required": ["api", "openapi", "target_api", "test_generation", "execution"],
+    "properties": {
+        "api": {
             "type": "object",
-            "required": ["api", "openapi", "target_api", "test_generation", "execution"],
+            "required": ["name", "version"],
             "properties": {
-                "api": {
-                    "type": "object",
-                    "required": ["name", "version"],
-                    "properties": {
-                        "name": {"type": "string"},
-                        "version": {"type": "string"},
-                        "description": {"type": "string"}
-                    }
-                },
-                "openapi": {
-                    "type": "object",
-                    "properties": {
-                        "spec_url": {"type": "string"},
-                        "spec_file": {"type": "string"},
-                        "spec_git": {
-                            "type": "object",
-                            "required": ["repo", "path"],
-                            "properties": {
-                                "repo": {"type": "string"},
-                                "path": {"type": "string"},
-                                "branch": {"type": "string"},
-                                "token": {"type": "string"}
-                            }
-                        }
-                    }
-                },
-                "target_api": {
-                    "type": "object",
-                    "required": ["base_url"],
-                    "properties": {
-                        "base_url": {"type": "string"},
-                        "timeout": {"type": "integer", "minimum": 1},
-                        "retries": {"type": "integer", "minimum": 0},
-                        "headers": {"type": "object"},
-                        "auth": {
-                            "type": "object",
-                            "properties": {
-                                "type": {"type": "string", "enum": ["bearer", "basic", "api_key"]},
-                                "token": {"type": "string"},
-                                "username": {"type": "string"},
-                                "password": {"type": "string"},
-                                "api_key": {"type": "string"},
-                                "api_key_header": {"type": "string"}
-                            }
-                        }
-                    }
-                },
-                "test_generation": {
-                    "type": "object",
-                    "required": ["output_dir"],
-                    "properties": {
-                        "output_dir": {"type": "string"},
-                        "templates": {"type": "array", "items": {"type": "string"}},
-                        "custom_tests": {"type": "array", "items": {"type": "string"}},
-                        "exclude_endpoints": {"type": "array", "items": {"type": "string"}},
-                        "include_only": {"type": "array", "items": {"type": "string"}}
-                    }
-                },
-                "execution": {
-                    "type": "object",
-                    "required": ["environment"],
-                    "properties": {
-                        "environment": {"type": "string"},
-                        "parallel": {"type": "boolean"},
-                        "max_parallel": {"type": "integer", "minimum": 1},
-                        "timeout": {"type": "integer", "minimum": 1},
-                        "retry_failed": {"type": "integer", "minimum": 0},
-                        "read_only": {"type": "boolean"}
-                    }
-                },
-                "validation": {
-                    "type": "object",
-                    "properties": {
-                        "strict_mode": {"type": "boolean"},
-                        "validate_responses": {"type": "boolean"},
-                        "validate_schemas": {"type": "boolean"},
-                        "check_contract_compliance": {"type": "boolean"}
-                    }
-                },
-                "docker": {
+                "name": {"type": "string"},
+                "version": {"type": "string"},
+                "description": {"type": "string"}
+            }
+        },
+        "openapi": {
+            "type": "object",
+            "properties": {
+                "spec_url": {"type": "string"},
+                "spec_file": {"type": "string"},
+                "cache_spec": {"type": "boolean"},
+                "spec_git": {
                     "type": "object",
+                    "required": ["repo", "path"],
                     "properties": {
-                        "enabled": {"type": "boolean"},
-                        "compose_file": {"type": "string"},
-                        "services": {"type": "array", "items": {"type": "string"}},
-                        "build_context": {"type": "string"}
+                        "repo": {"type": "string"},
+                        "path": {"type": "string"},
+                        "branch": {"type": "string"},
+                        "token": {"type": "string"}
                     }
-                },
-                "reporting": {
+                }
+            }
+        },
+        "target_api": {
+            "type": "object",
+            "required": ["base_url"],
+            "properties": {
+                "base_url": {"type": "string"},
+                "timeout": {"type": "integer", "minimum": 1},
+                "retries": {"type": "integer", "minimum": 0},
+                "headers": {"type": "object"},
+                "auth": {
                     "type": "object",
                     "properties": {
-                        "format": {"type": "array", "items": {"type": "string", "enum": ["console", "json", "junit", "html"]}},
-                        "output_dir": {"type": "string"},
-                        "include_request_logs": {"type": "boolean"},
-                        "include_response_logs": {"type": "boolean"}
+                        "type": {"type": "string", "enum": ["bearer", "basic", "api_key"]},
+                        "token": {"type": "string"},
+                        "username": {"type": "string"},
+                        "password": {"type": "string"},
+                        "api_key": {"type": "string"},
+                        "api_key_header": {"type": "string"}
                     }
                 }
             }
+        },
+        "test_generation": {
+            "type": "object",
+            "required": ["output_dir"],
+            "properties": {
+                "output_dir": {"type": "string"},
+                "templates": {"type": "array", "items": {"type": "string"}},
+                "custom_tests": {"type": "array", "items": {"type": "string"}},
+                "exclude_endpoints": {"type": "array", "items": {"type": "string"}},
+                "include_only": {"type": "array", "items": {"type": "string"}}
+            }
+        },
+        "execution": {
+            "type": "object",
+            "required": ["environment"],
+            "properties": {
+                "environment": {"type": "string"},
+                "parallel": {"type": "boolean"},
+                "max_parallel": {"type": "integer", "minimum": 1},
+                "timeout": {"type": "integer", "minimum": 1},
+                "retry_failed": {"type": "integer", "minimum": 0},
+                "read_only": {"type": "boolean"},
+                "cache_results": {"type": "boolean"},
+                "stage_tmpfs": {"type": "boolean"}
+            }
+        },
+        "validation": {
+            "type": "object",
+            "properties": {
+                "strict_mode": {"type": "boolean"},
+                "validate_responses": {"type": "boolean"},
+                "validate_schemas": {"type": "boolean"},
+                "check_contract_compliance": {"type": "boolean"}
+            }
+        },
+        "docker": {
+            "type": "object",
+            "properties": {
+                "enabled": {"type": "boolean"},
+                "compose_file": {"type": "string"},
+                "services": {"type": "array", "items": {"type": "string"}},
+                "build_context": {"type": "string"}
+            }
+        },
+        "reporting": {
+            "type": "object",
+            "properties": {
+                "format": {"type": "array", "items": {"type": "string", "enum": ["console", "json", "junit", "html"]}},
+                "output_dir": {"type": "string"},
+                "include_request_logs": {"type": "boolean"},
+                "include_response_logs": {"type": "boolean"}
+            }
         }
+    }
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _config_validator() -> Callable[[Any], Any]:
+    """Compile the configuration schema into a validation function, once."""
+    validator: Callable[[Any], Any] = fastjsonschema.compile(_CONFIG_SCHEMA)
+    return validator
+
+
+# Default project configuration written by `batman init`. Kept as pre-rendered
+# YAML so project creation never has to run the YAML emitter.
+_DEFAULT_MAIN_YAML = """\
+api:
+  name: My API
+  version: 1.0.0
+  description: API description
+openapi:
+  spec_url: https://api.example.com/openapi.json
+target_api:
+  base_url: https://api.example.com
+  timeout: 30
+  retries: 3
+  headers:
+    Content-Type: application/json
+test_generation:
+  output_dir: generated/tests
+  templates:
+  - basic
+  - crud
+  - error_handling
+execution:
+  environment: local
+  parallel: true
+  max_parallel: 4
+  timeout: 300
+  retry_failed: 1
+  read_only: false
+validation:
+  strict_mode: false
+  validate_responses: true
+  validate_schemas: true
+  check_contract_compliance: true
+docker:
+  enabled: false
+reporting:
+  format:
+  - console
+  - json
+  output_dir: reports
+  include_request_logs: true
+  include_response_logs: true
+"""
+
+_DEFAULT_ENV_YAML: Dict[str, str] = {
+    "local": """\
+target_api:
+  base_url: http://localhost:5000
+docker:
+  enabled: true
+  services:
+  - api
+  - database
+""",
+    "staging": """\
+target_api:
+  base_url: https://staging-api.example.com
+  timeout: 60
+  headers:
+    Authorization: Bearer ${STAGING_TOKEN}
+""",
+    "production": """\
+target_api:
+  base_url: https://api.example.com
+  timeout: 120
+  headers:
+    Authorization: Bearer ${PROD_TOKEN}
+execution:
+  read_only: true
+""",
+}
+
+# Parsed configs cached by ConfigManager.load_config_cached
+_CONFIG_CACHE_MAX_AGE = 7 * 24 * 60 * 60
+
+
+def cache_dir() -> Path:
+    """Get BATMAN's per-user cache directory.
+    
+    Parsed configurations are cached at its top level; other caches, such
+    as compiled templates, use subdirectories.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "batman"
+
+
+def _write_config_cache(cache_file: Path, config: Dict[str, Any]) -> None:
+    """Write a parsed configuration to the cache and drop stale entries.
+    
+    Caching is best effort; an unwritable cache directory is ignored.
+    """
+    try:
+        cache_file.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(config, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+        
+        cutoff = time.time() - _CONFIG_CACHE_MAX_AGE
+        for entry in cache_file.parent.glob("*.pkl"):
+            if entry.stat().st_mtime < cutoff:
+                entry.unlink()
+    except OSError:
+        pass
+
+
+@functools.lru_cache(maxsize=1)
+def get_http_session() -> "requests.Session":
+    """Get the process-wide HTTP session used to fetch OpenAPI specs.
+    
+    Sharing one session keeps connections alive (and DNS cached) across
+    fetches instead of paying a new TCP/TLS handshake each time.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    session = requests.Session()
+    session.headers.update({
+        'User-Agent': 'BATMAN-API-Testing-Framework/1.0.0'
+    })
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16,
+                          max_retries=Retry(total=3, backoff_factor=0.3))
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class ConfigManager:
+    """Manages configuration loading, validation, and environment handling."""
+    
+    def __init__(self):
+        # Shared across instances so the schema is built and compiled once per process
+        self.config_schema = _CONFIG_SCHEMA
     
     def load_config(self, config_path: Optional[str] = None, environment: Optional[str] = None) -> Dict[str, Any]:
         """Load configuration from file and environment."""
+        config_file = self._resolve_config_path(config_path)
+        config = self._load_merged_config(config_file, environment)
+        
+        # Process environment variables
+        config = self._process_env_variables(config)
+        
+        return config
+    
+    def load_config_cached(self, config_path: Optional[str] = None,
+                           environment: Optional[str] = None) -> Dict[str, Any]:
+        """Load configuration, reusing a parsed copy cached on disk when fresh.
+        
+        The cache holds the merged YAML *before* environment variable
+        substitution, keyed by the config and overlay files' paths, mtimes and
+        sizes, so edits invalidate it and exported secrets never reach disk.
+        """
+        config_file = self._resolve_config_path(config_path)
+        
+        key_parts = [str(config_file.resolve()), environment or ""]
+        for path in (config_file, self._env_config_path(config_file, environment)):
+            if path is not None and path.exists():
+                stat = path.stat()
+                key_parts.append(f"{stat.st_mtime_ns}:{stat.st_size}")
+            else:
+                key_parts.append("-")
+        key = hashlib.blake2b("|".join(key_parts).encode(), digest_size=16).hexdigest()
+        cache_file = cache_dir() / f"{key}.pkl"
+        
+        try:
+            config = pickle.loads(cache_file.read_bytes())
+        except Exception:
+            # Any unreadable, corrupt or incompatible cache entry is a miss
+            config = self._load_merged_config(config_file, environment)
+            _write_config_cache(cache_file, config)
+        
+        return self._process_env_variables(config)
+    
+    def _resolve_config_path(self, config_path: Optional[str]) -> Path:
+        """Resolve the configuration file path, checking that it exists."""
         if config_path is None:
             config_path = "config/test-config.yaml"
         
         config_file = Path(config_path)
         if not config_file.exists():
             raise FileNotFoundError(f"Configuration file not found: {config_path}")
-        
-        # Load main configuration
-        with open(config_file, 'r') as f:
-            config = yaml.safe_load(f)
+        return config_file
+    
+    def _env_config_path(self, config_file: Path, environment: Optional[str]) -> Optional[Path]:
+        """Get the path of the environment overlay for a configuration file."""
+        if not environment:
+            return None
+        return config_file.parent / "environments" / f"{environment}.yaml"
+    
+    def _load_merged_config(self, config_file: Path, environment: Optional[str]) -> Dict[str, Any]:
+        """Parse the main configuration and merge its environment overlay."""
+        # Load main configuration (one read, parsed from a contiguous buffer)
+        config = yaml.load(config_file.read_bytes(), Loader=_Loader)
         
         # Load environment-specific configuration if specified
-        if environment:
-            env_config_path = config_file.parent / "environments" / f"{environment}.yaml"
-            if env_config_path.exists():
-                with open(env_config_path, 'r') as f:
-                    env_config = yaml.safe_load(f)
-                    config = self._merge_configs(config, env_config)
-        
-        # Process environment variables
-        config = self._process_env_variables(config)
+        env_config_path = self._env_config_path(config_file, environment)
+        if env_config_path is not None and env_config_path.exists():
+            env_config = yaml.load(env_config_path.read_bytes(), Loader=_Loader)
+            if env_config:
+                # Freshly parsed, so safe to merge into without copying
+                self._merge_into(config, env_config)
         
         return config
     
-    def _merge_configs(self, base_config: Dict[str, Any], env_config: Dict[str, Any]) -> Dict[str, Any]:
-        """Merge environment configuration into base configuration."""
-        merged = base_config.copy()
-        
+    def _merge_into(self, base_config: Dict[str, Any], env_config: Dict[str, Any]) -> None:
+        """Merge environment configuration into base configuration in place."""
         for key, value in env_config.items():
-            if key in merged and isinstance(merged[key], dict) and isinstance(value, dict):
-                merged[key] = self._merge_configs(merged[key], value)
+            base_value = base_config.get(key)
+            if isinstance(base_value, dict) and isinstance(value, dict):
+                self._merge_into(base_value, value)
             else:
-                merged[key] = value
-        
-        return merged
+                base_config[key] = value
     
     def _process_env_variables(self, config: Dict[str, Any]) -> Dict[str, Any]:
-        """Process environment variable substitutions in configuration."""
-        def process_value(value):
-            if isinstance(value, str):
-                # Simple environment variable substitution
-                if value.startswith("${") and value.endswith("}"):
-                    env_var = value[2:-1]
-                    return os.getenv(env_var, value)
-                return value
-            elif isinstance(value, dict):
-                return {k: process_value(v) for k, v in value.items()}
-            elif isinstance(value, list):
-                return [process_value(item) for item in value]
-            else:
-                return value
+        """Process environment variable substitutions in configuration.
+
+        Substitution happens in place; only string values of the form
+        ``${VAR}`` are replaced, the surrounding containers are left as-is.
+        """
+        # The YAML safe loader only produces builtin types, so exact type
+        # checks are safe here and cheaper than isinstance
+        environ_get = os.environ.get
+        stack: List[Any] = [config] if type(config) in (dict, list) else []
+        while stack:
+            node = stack.pop()
+            items = node.items() if type(node) is dict else enumerate(node)
+            for key, value in items:
+                value_type = type(value)
+                if value_type is str:
+                    # Cheap substring check first; most values are not references
+                    if '${' not in value:
+                        continue
+                    match = _ENV_VAR_RE.fullmatch(value)
+                    if match:
+                        node[key] = environ_get(match.group(1), value)
+                elif value_type is dict or value_type is list:
+                    stack.append(value)
         
-        return process_value(config)
+        return config
     
     def validate_config(self, config: Dict[str, Any]) -> bool:
         """Validate configuration against schema."""
         try:
-            validate(instance=config, schema=self.config_schema)
+            _config_validator()(config)
             return True
-        except jsonschema.ValidationError as e:
+        except fastjsonschema.JsonSchemaValueException as e:
             raise ValueError(f"Configuration validation error: {e.message}")
     
     def create_default_config(self, project_path: Path) -> None:
@@ -191,89 +394,8 @@ class ConfigManager:
         config_dir = project_path / "config"
         
         # Main configuration
-        main_config = {
-            "api": {
-                "name": "My API",
-                "version": "1.0.0",
-                "description": "API description"
-            },
-            "openapi": {
-                "spec_url": "https://api.example.com/openapi.json"
-            },
-            "target_api": {
-                "base_url": "https://api.example.com",
-                "timeout": 30,
-                "retries": 3,
-                "headers": {
-                    "Content-Type": "application/json"
-                }
-            },
-            "test_generation": {
-                "output_dir": "generated/tests",
-                "templates": ["basic", "crud", "error_handling"]
-            },
-            "execution": {
-                "environment": "local",
-                "parallel": True,
-                "max_parallel": 4,
-                "timeout": 300,
-                "retry_failed": 1,
-                "read_only": False
-            },
-            "validation": {
-                "strict_mode": False,
-                "validate_responses": True,
-                "validate_schemas": True,
-                "check_contract_compliance": True
-            },
-            "docker": {
-                "enabled": False
-            },
-            "reporting": {
-                "format": ["console", "json"],
-                "output_dir": "reports",
-                "include_request_logs": True,
-                "include_response_logs": True
-            }
-        }
-        
-        with open(config_dir / "test-config.yaml", 'w') as f:
-            yaml.dump(main_config, f, default_flow_style=False, sort_keys=False)
+        (config_dir / "test-config.yaml").write_text(_DEFAULT_MAIN_YAML)
         
         # Environment configurations
-        environments = {
-            "local": {
-                "target_api": {
-                    "base_url": "http://localhost:5000"
-                },
-                "docker": {
-                    "enabled": True,
-                    "services": ["api", "database"]
-                }
-            },
-            "staging": {
-                "target_api": {
-                    "base_url": "https://staging-api.example.com",
-                    "timeout": 60,
-                    "headers": {
-                        "Authorization": "Bearer ${STAGING_TOKEN}"
-                    }
-                }
-            },
-            "production": {
-                "target_api": {
-                    "base_url": "https://api.example.com",
-                    "timeout": 120,
-                    "headers": {
-                        "Authorization": "Bearer ${PROD_TOKEN}"
-                    }
-                },
-                "execution": {
-                    "read_only": True
-                }
-            }
-        }
-        
-        for env_name, env_config in environments.items():
-            with open(config_dir / "environments" / f"{env_name}.yaml", 'w') as f:
-                yaml.dump(env_config, f, default_flow_style=False, sort_keys=False)
+        for env_name, env_yaml in _DEFAULT_ENV_YAML.items():
+            (config_dir / "environments" / f"{env_name}.yaml").write_text(env_yaml)
@@ -2,20 +2,109 @@
 Docker integration for BATMAN API Testing Framework.
 """
 
+import functools
 import os
+import shutil
 import subprocess
+import sys
 import tempfile
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
 import yaml
 
 
+def _run_streamed(cmd: List[str], tail_lines: int = 200) -> Tuple[int, str]:
+    """Run a command, echoing its output live instead of buffering it.
+
+    Returns the exit code and the last ``tail_lines`` lines of combined output.
+    """
+    tail: deque = deque(maxlen=tail_lines)
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                               text=True, bufsize=1)
+    assert process.stdout is not None
+    for line in process.stdout:
+        sys.stdout.write(line)
+        tail.append(line)
+    return process.wait(), ''.join(tail)
+
+
+@functools.lru_cache(maxsize=1)
+def _docker_available() -> bool:
+    """Check once per process whether the Docker CLI is on PATH."""
+    return shutil.which('docker') is not None
+
+
+@functools.lru_cache(maxsize=1)
+def compose_command() -> Tuple[str, ...]:
+    """Return the Docker Compose invocation, preferring the `docker compose` plugin.
+    
+    The Go plugin starts much faster than the legacy Python `docker-compose`
+    binary, so it is used whenever it is installed.
+    """
+    try:
+        result = subprocess.run(['docker', 'compose', 'version'],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        if result.returncode == 0:
+            return ('docker', 'compose')
+    except FileNotFoundError:
+        pass
+    return ('docker-compose',)
+
+
+# Written verbatim by DockerfileGenerator; the content is static
+_DOCKERFILE = b'''FROM ubuntu:22.04
+
+# Install system dependencies
+RUN apt-get update && apt-get install -y \\
+    curl \\
+    jq \\
+    git \\
+    python3 \\
+    python3-pip \\
+    bats \\
+    && rm -rf /var/lib/apt/lists/*
+
+# Install Python dependencies
+COPY requirements.txt /tmp/
+RUN pip3 install -r /tmp/requirements.txt
+
+# Install jsonschema for validation
+RUN pip3 install jsonschema
+
+# Set working directory
+WORKDIR /tests
+
+# Copy test files
+COPY generated/tests/ /tests/
+COPY config/ /config/
+
+# Set environment variables
+ENV API_BASE_URL=""
+ENV TEST_ENVIRONMENT="docker"
+
+# Make test files executable
+RUN chmod +x /tests/*.bats
+
+# Default command
+CMD ["bats", "/tests"]
+'''
+
+
 class DockerManager:
     """Manages Docker containers and services for testing."""
     
     def __init__(self):
         self.compose_file = None
         self.temp_dir = None
+        # One pooled session so health-check polls reuse connections
+        self._session = requests.Session()
+        self._session.mount('http://', HTTPAdapter(pool_connections=8, pool_maxsize=8))
+        self._session.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=8))
     
     def setup_docker_environment(self, config: Dict[str, Any]) -> bool:
         """Setup Docker environment for testing."""
@@ -42,12 +131,12 @@ class DockerManager:
             return False
         
         try:
-            cmd = ['docker-compose', '-f', self.compose_file, 'up', '-d']
+            cmd = [*compose_command(), '-f', self.compose_file, 'up', '-d']
             if services:
                 cmd.extend(services)
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            return result.returncode == 0
+            returncode, _ = _run_streamed(cmd)
+            return returncode == 0
             
         except Exception as e:
             print(f"Error starting Docker services: {e}")
@@ -59,9 +148,9 @@ class DockerManager:
             return False
         
         try:
-            cmd = ['docker-compose', '-f', self.compose_file, 'down']
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            return result.returncode == 0
+            cmd = [*compose_command(), '-f', self.compose_file, 'down']
+            returncode, _ = _run_streamed(cmd)
+            return returncode == 0
             
         except Exception as e:
             print(f"Error stopping Docker services: {e}")
@@ -69,23 +158,45 @@ class DockerManager:
     
     def wait_for_service(self, service_name: str, health_check_url: str, 
                         timeout: int = 60) -> bool:
-        """Wait for a service to be ready."""
-        import time
-        import requests
+        """Wait for a service to be ready.
         
-        start_time = time.time()
+        Polls with exponential backoff (0.1s doubling up to 2s) so a service that
+        comes up quickly is noticed quickly, and a slow one is not hammered.
+        """
+        deadline = time.monotonic() + timeout
+        delay = 0.1
         
-        while time.time() - start_time < timeout:
+        while True:
             try:
-                response = requests.get(health_check_url, timeout=5)
+                # Short connect timeout so a dead endpoint fails fast
+                response = self._session.get(health_check_url, timeout=(0.5, 2.0))
                 if response.status_code == 200:
                     return True
             except requests.RequestException:
                 pass
             
-            time.sleep(2)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 2.0)
+    
+    def wait_for_services(self, services: List[Tuple[str, str]],
+                          timeout: int = 60) -> Dict[str, bool]:
+        """Wait for several services concurrently.
+        
+        Takes ``(service_name, health_check_url)`` pairs and returns a mapping of
+        service name to readiness.
+        """
+        if not services:
+            return {}
         
-        return False
+        with ThreadPoolExecutor(max_workers=len(services)) as executor:
+            futures = {
+                name: executor.submit(self.wait_for_service, name, url, timeout)
+                for name, url in services
+            }
+            return {name: future.result() for name, future in futures.items()}
     
     def get_service_url(self, service_name: str, port: int) -> str:
         """Get URL for a Docker service."""
@@ -93,11 +204,7 @@ class DockerManager:
     
     def _check_docker_available(self) -> bool:
         """Check if Docker is available."""
-        try:
-            result = subprocess.run(['docker', '--version'], capture_output=True, text=True)
-            return result.returncode == 0
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return False
+        return _docker_available()
     
     def _generate_docker_compose(self, config: Dict[str, Any]) -> None:
         """Generate Docker Compose file."""
@@ -111,45 +218,7 @@ class DockerfileGenerator:
     
     def generate_dockerfile(self, config: Dict[str, Any], output_path: str = "Dockerfile") -> None:
         """Generate Dockerfile for testing."""
-        dockerfile_content = '''FROM ubuntu:22.04
-
-# Install system dependencies
-RUN apt-get update && apt-get install -y \\
-    curl \\
-    jq \\
-    git \\
-    python3 \\
-    python3-pip \\
-    bats \\
-    && rm -rf /var/lib/apt/lists/*
-
-# Install Python dependencies
-COPY requirements.txt /tmp/
-RUN pip3 install -r /tmp/requirements.txt
-
-# Install jsonschema for validation
-RUN pip3 install jsonschema
-
-# Set working directory
-WORKDIR /tests
-
-# Copy test files
-COPY generated/tests/ /tests/
-COPY config/ /config/
-
-# Set environment variables
-ENV API_BASE_URL=""
-ENV TEST_ENVIRONMENT="docker"
-
-# Make test files executable
-RUN chmod +x /tests/*.bats
-
-# Default command
-CMD ["bats", "/tests"]
-'''
-        
-        with open(output_path, 'w') as f:
-            f.write(dockerfile_content)
+        Path(output_path).write_bytes(_DOCKERFILE)
 
 
 class DockerTestRunner:
@@ -177,25 +246,28 @@ class DockerTestRunner:
                 raise RuntimeError("Failed to start Docker services")
             
             # Wait for services to be ready
-            for service in services:
-                health_url = f"http://localhost:8080/health"  # Default health check
-                if not self.docker_manager.wait_for_service(service, health_url):
+            health_url = "http://localhost:8080/health"  # Default health check
+            readiness = self.docker_manager.wait_for_services(
+                [(service, health_url) for service in services]
+            )
+            for service, ready in readiness.items():
+                if not ready:
                     print(f"Warning: Service {service} may not be ready")
         
         # Run tests in container
         try:
             cmd = [
-                'docker-compose', '-f', 'docker-compose.yml', 
+                *compose_command(), '-f', 'docker-compose.yml',
                 'run', '--rm', 'api-testing'
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            returncode, output = _run_streamed(cmd)
             
             return {
-                'success': result.returncode == 0,
-                'output': result.stdout,
-                'error': result.stderr,
-                'exit_code': result.returncode
+                'success': returncode == 0,
+                'output': output,
+                'error': '' if returncode == 0 else f"docker-compose exited with code {returncode}",
+                'exit_code': returncode
             }
             
         except Exception as e:
@@ -213,7 +285,7 @@ class DockerTestRunner:
     def build_test_image(self, config: Dict[str, Any]) -> bool:
         """Build Docker image for testing."""
         try:
-            cmd = ['docker-compose', '-f', 'docker-compose.yml', 'build']
+            cmd = [*compose_command(), '-f', 'docker-compose.yml', 'build']
             result = subprocess.run(cmd, capture_output=True, text=True)
             return result.returncode == 0
         except Exception as e:
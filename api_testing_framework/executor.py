@@ -2,15 +2,117 @@
 Test execution engine for BATMAN API Testing Framework.
 """
 
+import atexit
+import functools
+import hashlib
+import html
 import os
+import re
+import selectors
+import shutil
 import subprocess
+import tempfile
 import time
 import threading
+from collections import deque
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Pattern, Tuple
+from dataclasses import asdict, dataclass
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import json
+import xml.etree.ElementTree as ET
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# bats-core 1.2 is the oldest release the batched runner is exercised against
+_BATS_BATCH_MIN_VERSION = (1, 2)
+
+_BATS_TEST_RE = re.compile(rb'^[ \t]*@test[ \t]', re.MULTILINE)
+_TAP_PLAN_RE = re.compile(r'^1\.\.(\d+)$')
+# TAP plan and result lines, kept even once a batched run's output is truncated
+_TAP_RESULT_RE = re.compile(rb'1\.\.\d+|(?:not )?ok \d+')
+
+# Environment variables set for the tests; part of the result cache key
+_RESULT_CACHE_ENV_VARS = (
+    'API_BASE_URL', 'AUTH_TOKEN', 'AUTH_USERNAME', 'AUTH_PASSWORD',
+    'API_KEY', 'API_KEY_HEADER', 'TIMEOUT', 'MAX_RETRIES',
+)
+
+# Worker pools reused across run_tests calls, keyed by size
+_POOL_CACHE: Dict[int, ThreadPoolExecutor] = {}
+_POOL_LOCK = threading.Lock()
+
+
+def _get_pool(max_workers: int) -> ThreadPoolExecutor:
+    """Get a shared thread pool of the given size, creating it on first use."""
+    with _POOL_LOCK:
+        pool = _POOL_CACHE.get(max_workers)
+        if pool is None:
+            pool = ThreadPoolExecutor(max_workers=max_workers)
+            _POOL_CACHE[max_workers] = pool
+        return pool
+
+
+@functools.lru_cache(maxsize=1)
+def _bats_executable() -> Optional[str]:
+    """Resolve the BATS executable on PATH once per process."""
+    return shutil.which('bats')
+
+
+@functools.lru_cache(maxsize=1)
+def _bats_version() -> Optional[Tuple[int, ...]]:
+    """Probe the installed BATS version once per process.
+    
+    Returns None when BATS is unavailable, and ``(0, 0)`` when it runs but
+    reports a version that cannot be parsed.
+    """
+    bats = _bats_executable()
+    if bats is None:
+        return None
+    
+    try:
+        result = subprocess.run([bats, '--version'], capture_output=True, text=True)
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    
+    match = re.search(r'(\d+)\.(\d+)', result.stdout)
+    return tuple(int(part) for part in match.groups()) if match else (0, 0)
+
+
+@atexit.register
+def _shutdown_pools() -> None:
+    """Shut down shared thread pools at interpreter exit."""
+    with _POOL_LOCK:
+        for pool in _POOL_CACHE.values():
+            pool.shutdown(wait=False)
+        _POOL_CACHE.clear()
+
+
+# RAM-backed filesystem used to stage tests when execution.stage_tmpfs is set
+_TMPFS_ROOT = '/dev/shm'
+
+# Output kept per child stream; memory per worker stays bounded however chatty a test is
+_OUTPUT_LIMIT = 256 * 1024
+_READ_CHUNK = 64 * 1024
+_TRUNCATED_MARKER = b"\n...truncated...\n"
+# Longest line still matched against keep_lines once output is truncated
+_MAX_KEPT_LINE = 4096
+
+
+def _json_indented(obj: Any, newline: bytes) -> bytes:
+    """Encode obj as two-space indented JSON, nesting lines under newline."""
+    encoded: bytes
+    if orjson is not None:
+        encoded = orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    else:
+        encoded = json.dumps(obj, indent=2).encode()
+    # JSON escapes newlines inside strings, so every raw newline is structural
+    return encoded.replace(b'\n', newline)
 
 
 @dataclass
@@ -35,12 +137,256 @@ class ExecutionResults:
     success: bool
 
 
+@dataclass
+class _ProcessOutcome:
+    """Raw outcome of a child process run by the reaper."""
+    key: Any
+    returncode: int
+    stdout: str
+    stderr: str
+    duration: float
+    timed_out: bool = False
+    error: Optional[str] = None
+
+
+class _CappedOutput:
+    """Output of one child stream, capped at ``limit`` bytes.
+    
+    Past the cap data is dropped, except for complete lines matching ``keep``,
+    which are still appended after the truncation marker.
+    """
+    
+    def __init__(self, limit: int, keep: Optional[Pattern[bytes]] = None):
+        self.data = bytearray()
+        self.limit = limit
+        self.keep = keep
+        self.truncated = False
+        # Partial line seen since truncation; None while skipping an overlong line
+        self._line: Optional[bytearray] = bytearray()
+    
+    def append(self, chunk: memoryview) -> None:
+        """Append a chunk of output, applying the cap."""
+        if not self.truncated:
+            room = self.limit - len(self.data)
+            if room >= len(chunk):
+                self.data.extend(chunk)
+                return
+            self.data.extend(chunk[:room])
+            self.truncated = True
+            if self.keep is not None:
+                # Cut on a line boundary so the cut line can be matched whole
+                cut = self.data.rfind(b'\n') + 1
+                self._line = self.data[cut:]
+                del self.data[cut:]
+            self.data.extend(_TRUNCATED_MARKER)
+            chunk = chunk[room:]
+        
+        if self.keep is None:
+            return
+        
+        lines = bytes(chunk).split(b'\n')
+        for line in lines[:-1]:
+            if self._line is not None:
+                self._line.extend(line)
+                self._keep_line(self._line)
+            self._line = bytearray()
+        if self._line is not None:
+            self._line.extend(lines[-1])
+            if len(self._line) > _MAX_KEPT_LINE:
+                self._line = None
+    
+    def text(self) -> str:
+        """Decode the kept output, including a final line without a newline."""
+        if self.truncated and self.keep is not None and self._line:
+            self._keep_line(self._line)
+            self._line = bytearray()
+        return self.data.decode('utf-8', errors='replace')
+    
+    def _keep_line(self, line: bytearray) -> None:
+        """Append a complete line past the cap if it matches ``keep``."""
+        if self.keep is not None and len(line) <= _MAX_KEPT_LINE and self.keep.match(line):
+            self.data.extend(line)
+            self.data.extend(b'\n')
+
+
+@dataclass
+class _ChildProcess:
+    """Bookkeeping for a running child process."""
+    key: Any
+    process: subprocess.Popen
+    start_time: float
+    deadline: float
+    stdout: _CappedOutput
+    stderr: _CappedOutput
+    open_pipes: int = 2
+    pidfd: Optional[int] = None
+    exited: bool = False
+
+
+class _ProcessReaper:
+    """Runs child processes concurrently from a single thread.
+    
+    The stdout/stderr pipes of every running child are multiplexed through one
+    selector (epoll on Linux), so no thread sits blocked in a per-child
+    ``subprocess.run``. Only usable where pipes can be registered with a
+    selector, i.e. POSIX.
+    
+    Where the kernel supports pidfds (Linux 5.3+, Python 3.9+), each child's
+    pidfd is registered alongside its pipes so its exit wakes the loop
+    directly, even if a grandchild still holds the output pipes open.
+    
+    Every pipe read lands in one preallocated scratch buffer owned by the
+    reaper, so reads do not allocate a fresh bytes object each time.
+    
+    Output is capped per stream; lines matching ``keep_lines`` survive the
+    cap so a batched run's TAP results are never lost to a chatty test.
+    """
+    
+    supported = os.name == 'posix'
+    use_pidfd = hasattr(os, 'pidfd_open')
+    
+    def __init__(self, max_parallel: int, output_limit: int = _OUTPUT_LIMIT,
+                 env: Optional[Dict[str, str]] = None,
+                 keep_lines: Optional[Pattern[bytes]] = None):
+        self.max_parallel = max(1, max_parallel)
+        self.output_limit = output_limit
+        self.env = env
+        self.keep_lines = keep_lines
+        self._read_buffer = bytearray(_READ_CHUNK)
+        self._read_view = memoryview(self._read_buffer)
+    
+    def run(self, jobs: Iterable[Tuple[Any, List[str], Path, float]]) -> Iterator[_ProcessOutcome]:
+        """Run ``(key, cmd, cwd, timeout)`` jobs, yielding outcomes as children finish."""
+        pending = deque(jobs)
+        running: Dict[int, _ChildProcess] = {}
+        selector = selectors.DefaultSelector()
+        
+        try:
+            while pending or running:
+                while pending and len(running) < self.max_parallel:
+                    key, cmd, cwd, timeout = pending.popleft()
+                    start_time = time.time()
+                    try:
+                        process = subprocess.Popen(cmd, stdout=subprocess.PIPE,
+                                                   stderr=subprocess.PIPE, cwd=cwd,
+                                                   env=self.env)
+                    except Exception as e:
+                        yield _ProcessOutcome(key=key, returncode=1, stdout="", stderr="",
+                                              duration=time.time() - start_time, error=str(e))
+                        continue
+                    
+                    assert process.stdout is not None and process.stderr is not None
+                    child = _ChildProcess(
+                        key=key, process=process, start_time=start_time,
+                        deadline=start_time + timeout,
+                        stdout=_CappedOutput(self.output_limit, self.keep_lines),
+                        stderr=_CappedOutput(self.output_limit, self.keep_lines)
+                    )
+                    selector.register(process.stdout, selectors.EVENT_READ, (child, child.stdout))
+                    selector.register(process.stderr, selectors.EVENT_READ, (child, child.stderr))
+                    self._register_pidfd(child, selector)
+                    running[process.pid] = child
+                
+                # Nothing registered means nothing to wait on
+                if not running:
+                    continue
+                
+                wait = min(child.deadline for child in running.values()) - time.time()
+                for selector_key, _ in selector.select(max(wait, 0)):
+                    child, buffer = selector_key.data
+                    if buffer is None:
+                        # pidfd became readable: the child has exited
+                        child.exited = True
+                        continue
+                    count = os.readv(selector_key.fd, (self._read_buffer,))
+                    if count:
+                        buffer.append(self._read_view[:count])
+                    else:
+                        selector.unregister(selector_key.fileobj)
+                        selector_key.fileobj.close()  # type: ignore[union-attr]
+                        child.open_pipes -= 1
+                
+                now = time.time()
+                for pid, child in list(running.items()):
+                    if child.exited or child.open_pipes == 0:
+                        del running[pid]
+                        self._release(child, selector, drain=True)
+                        yield self._outcome(child, child.process.wait(), now)
+                    elif now >= child.deadline:
+                        del running[pid]
+                        child.process.kill()
+                        self._release(child, selector, drain=False)
+                        child.process.wait()
+                        yield self._outcome(child, 1, now, timed_out=True)
+        finally:
+            for child in running.values():
+                child.process.kill()
+                self._release(child, selector, drain=False)
+                child.process.wait()
+            selector.close()
+    
+    def _register_pidfd(self, child: _ChildProcess, selector: selectors.BaseSelector) -> None:
+        """Watch the child's exit through a pidfd when the kernel supports it."""
+        if not _ProcessReaper.use_pidfd:
+            return
+        try:
+            child.pidfd = os.pidfd_open(child.process.pid)
+        except OSError:
+            # Kernel without pidfd support; fall back to pipe EOF detection
+            _ProcessReaper.use_pidfd = False
+            return
+        selector.register(child.pidfd, selectors.EVENT_READ, (child, None))
+    
+    def _release(self, child: _ChildProcess, selector: selectors.BaseSelector,
+                 drain: bool) -> None:
+        """Unregister and close a child's pipes and pidfd.
+        
+        With ``drain`` set, output still buffered in the pipes is read first
+        without blocking, since an exited child may leave data unread.
+        """
+        for pipe, buffer in ((child.process.stdout, child.stdout),
+                             (child.process.stderr, child.stderr)):
+            if pipe is None or pipe.closed:
+                continue
+            selector.unregister(pipe)
+            if drain:
+                os.set_blocking(pipe.fileno(), False)
+                try:
+                    while True:
+                        count = os.readv(pipe.fileno(), (self._read_buffer,))
+                        if not count:
+                            break
+                        buffer.append(self._read_view[:count])
+                except BlockingIOError:
+                    pass
+            pipe.close()
+        
+        if child.pidfd is not None:
+            selector.unregister(child.pidfd)
+            os.close(child.pidfd)
+            child.pidfd = None
+    
+    def _outcome(self, child: _ChildProcess, returncode: int, now: float,
+                 timed_out: bool = False) -> _ProcessOutcome:
+        """Build the outcome for a finished child."""
+        return _ProcessOutcome(
+            key=child.key,
+            returncode=returncode,
+            stdout=child.stdout.text(),
+            stderr=child.stderr.text(),
+            duration=now - child.start_time,
+            timed_out=timed_out
+        )
+
+
 class TestExecutor:
     """Executes BATS tests with support for parallel execution."""
     
     def __init__(self):
         self.results = []
         self.start_time = None
+        # Environment for test processes; None inherits os.environ
+        self._child_env: Optional[Dict[str, str]] = None
     
     def run_tests(self, config: Dict[str, Any], docker: bool = False, 
                   parallel: bool = False, verbose: bool = False) -> ExecutionResults:
@@ -62,11 +408,18 @@ class TestExecutor:
             raise ValueError(f"No test files found in {output_dir}")
         
         # Setup environment
-        self._setup_environment(config)
+        self._child_env = self._build_env(config)
+        
+        stage_tmpfs = parallel and execution_config.get('stage_tmpfs', False)
         
         # Execute tests
         if docker:
             results = self._run_docker_tests(config, test_files, verbose)
+        elif execution_config.get('cache_results', False):
+            results = self._run_cached_tests(output_dir, test_files, parallel, stage_tmpfs,
+                                             max_parallel, timeout, verbose)
+        elif stage_tmpfs:
+            results = self._run_staged_tests(output_dir, test_files, max_parallel, timeout, verbose)
         elif parallel:
             results = self._run_parallel_tests(test_files, max_parallel, timeout, verbose)
         else:
@@ -88,46 +441,178 @@ class TestExecutor:
     
     def _find_test_files(self, output_dir: Path) -> List[Path]:
         """Find all BATS test files in the output directory."""
-        test_files = []
-        
-        if output_dir.exists():
-            # Find .bats files
-            for pattern in ['*.bats', '**/*.bats']:
-                test_files.extend(output_dir.glob(pattern))
+        if not output_dir.is_dir():
+            return []
         
-        return sorted(test_files)
+        return sorted(set(self._iter_bats_files(output_dir)))
+    
+    def _iter_bats_files(self, root: Path) -> Iterator[Path]:
+        """Yield every ``.bats`` file under root in a single directory walk."""
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(Path(entry.path))
+                        elif entry.name.endswith('.bats') and entry.is_file():
+                            yield Path(entry.path)
+            except OSError:
+                continue
     
-    def _setup_environment(self, config: Dict[str, Any]) -> None:
-        """Setup environment variables for test execution."""
+    def _build_env(self, config: Dict[str, Any]) -> Dict[str, str]:
+        """Build the environment passed to test processes.
+        
+        The process-wide ``os.environ`` is left untouched; one dict is built
+        per run and handed to every child, which also keeps concurrent runs
+        from clobbering each other's settings.
+        """
+        env = os.environ.copy()
         target_api = config.get('target_api', {})
         
         # Set API base URL
-        os.environ['API_BASE_URL'] = target_api.get('base_url', '')
+        env['API_BASE_URL'] = target_api.get('base_url', '')
         
         # Set authentication
         auth = target_api.get('auth')
         if auth:
             if auth.get('type') == 'bearer' and auth.get('token'):
-                os.environ['AUTH_TOKEN'] = auth['token']
+                env['AUTH_TOKEN'] = auth['token']
             elif auth.get('type') == 'basic':
                 if auth.get('username'):
-                    os.environ['AUTH_USERNAME'] = auth['username']
+                    env['AUTH_USERNAME'] = auth['username']
                 if auth.get('password'):
-                    os.environ['AUTH_PASSWORD'] = auth['password']
+                    env['AUTH_PASSWORD'] = auth['password']
             elif auth.get('type') == 'api_key':
                 if auth.get('api_key'):
-                    os.environ['API_KEY'] = auth['api_key']
+                    env['API_KEY'] = auth['api_key']
                 if auth.get('api_key_header'):
-                    os.environ['API_KEY_HEADER'] = auth['api_key_header']
+                    env['API_KEY_HEADER'] = auth['api_key_header']
         
         # Set timeout
-        os.environ['TIMEOUT'] = str(target_api.get('timeout', 30))
+        env['TIMEOUT'] = str(target_api.get('timeout', 30))
         
         # Set retries
-        os.environ['MAX_RETRIES'] = str(target_api.get('retries', 3))
+        env['MAX_RETRIES'] = str(target_api.get('retries', 3))
+        
+        return env
+    
+    def _run_staged_tests(self, output_dir: Path, test_files: List[Path], max_parallel: int,
+                          timeout: int, verbose: bool) -> List[TestResult]:
+        """Run tests in parallel from a RAM-backed copy of the output directory.
+        
+        Falls back to running in place where /dev/shm is not available.
+        """
+        if not os.path.ismount(_TMPFS_ROOT):
+            if verbose:
+                print(f"Warning: {_TMPFS_ROOT} is not available, running tests in place")
+            return self._run_parallel_tests(test_files, max_parallel, timeout, verbose)
+        
+        stage_dir = Path(tempfile.mkdtemp(prefix='batman-', dir=_TMPFS_ROOT))
+        try:
+            staged_root = stage_dir / output_dir.name
+            shutil.copytree(output_dir, staged_root, symlinks=True,
+                            ignore=shutil.ignore_patterns('.bats-cache'))
+            originals = {}
+            for test_file in test_files:
+                originals[str(staged_root / test_file.relative_to(output_dir))] = str(test_file)
+            
+            results = self._run_parallel_tests([Path(p) for p in originals], max_parallel,
+                                               timeout, verbose)
+        finally:
+            shutil.rmtree(stage_dir, ignore_errors=True)
+        
+        # Report results against the generated files, not the staged copies
+        staged_prefix, original_prefix = str(staged_root), str(output_dir)
+        for result in results:
+            result.test_file = originals.get(result.test_file, result.test_file)
+            result.output = result.output.replace(staged_prefix, original_prefix)
+            if result.error_message:
+                result.error_message = result.error_message.replace(staged_prefix, original_prefix)
+        return results
+    
+    def _run_cached_tests(self, output_dir: Path, test_files: List[Path], parallel: bool,
+                          stage_tmpfs: bool, max_parallel: int, timeout: int,
+                          verbose: bool) -> List[TestResult]:
+        """Run tests, reusing earlier passing results for unchanged test files.
+        
+        A result is reused when the test file, the helpers next to it, the BATS
+        binary and the test environment are all unchanged. Only passing results
+        are cached, because failures against a live API are worth re-running.
+        The remaining files are staged to tmpfs when ``stage_tmpfs`` is set.
+        """
+        cache_dir = output_dir / '.bats-cache'
+        env_fingerprint = self._env_fingerprint()
+        results = []
+        cache_keys = {}
+        uncached_files = []
+        
+        for test_file in test_files:
+            key = self._result_cache_key(test_file, env_fingerprint)
+            cached = self._result_cache_lookup(cache_dir, key)
+            if cached is None:
+                cache_keys[str(test_file)] = key
+                uncached_files.append(test_file)
+            else:
+                results.append(cached)
+                if verbose:
+                    self._print_test_result(cached)
+        
+        if not uncached_files:
+            new_results = []
+        elif stage_tmpfs:
+            new_results = self._run_staged_tests(output_dir, uncached_files, max_parallel,
+                                                 timeout, verbose)
+        elif parallel:
+            new_results = self._run_parallel_tests(uncached_files, max_parallel, timeout, verbose)
+        else:
+            new_results = self._run_sequential_tests(uncached_files, timeout, verbose)
+        
+        for result in new_results:
+            if result.success:
+                self._result_cache_store(cache_dir, cache_keys[result.test_file], result)
+        
+        return results + new_results
+    
+    def _env_fingerprint(self) -> bytes:
+        """Fingerprint the environment variables the tests read."""
+        env = os.environ if self._child_env is None else self._child_env
+        return '\0'.join(
+            f"{name}={env.get(name, '')}" for name in _RESULT_CACHE_ENV_VARS
+        ).encode()
+    
+    def _result_cache_key(self, test_file: Path, env_fingerprint: bytes) -> str:
+        """Hash everything that can change the outcome of a test file."""
+        digest = hashlib.blake2b(digest_size=16)
+        bats = _bats_executable()
+        digest.update(str(os.stat(bats).st_mtime_ns if bats else 0).encode())
+        digest.update(env_fingerprint)
+        for path in [test_file, *sorted(test_file.parent.glob('*.bash'))]:
+            digest.update(b'\0')
+            digest.update(path.read_bytes())
+        return digest.hexdigest()
+    
+    def _result_cache_lookup(self, cache_dir: Path, key: str) -> Optional[TestResult]:
+        """Load a cached test result, if present."""
+        try:
+            return TestResult(**json.loads((cache_dir / f"{key}.json").read_bytes()))
+        except (OSError, ValueError, TypeError):
+            return None
+    
+    def _result_cache_store(self, cache_dir: Path, key: str, result: TestResult) -> None:
+        """Store a test result in the cache; failures to write are ignored."""
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            (cache_dir / f"{key}.json").write_text(json.dumps(asdict(result)))
+        except OSError:
+            pass
     
     def _run_sequential_tests(self, test_files: List[Path], timeout: int, verbose: bool) -> List[TestResult]:
         """Run tests sequentially."""
+        if self._can_batch_tests():
+            return self._run_batched_tests(test_files, 1, timeout, verbose)
+        
         results = []
         
         for test_file in test_files:
@@ -142,38 +627,218 @@ class TestExecutor:
     def _run_parallel_tests(self, test_files: List[Path], max_parallel: int, 
                            timeout: int, verbose: bool) -> List[TestResult]:
         """Run tests in parallel."""
+        if not _ProcessReaper.supported:
+            return self._run_threaded_tests(test_files, max_parallel, timeout, verbose)
+        
+        if not self._check_bats_available():
+            results = [self._bats_unavailable_result(test_file) for test_file in test_files]
+            if verbose:
+                for result in results:
+                    self._print_test_result(result)
+            return results
+        
+        if self._can_batch_tests():
+            return self._run_batched_tests(test_files, max_parallel, timeout, verbose)
+        
+        jobs = []
+        for test_file in test_files:
+            cmd = [_bats_executable() or 'bats', str(test_file)]
+            if verbose:
+                print(f"Running: {' '.join(cmd)}")
+            jobs.append((test_file, cmd, test_file.parent, timeout))
+        
+        results = []
+        for outcome in _ProcessReaper(max_parallel, env=self._child_env).run(jobs):
+            result = self._result_from_outcome(outcome, timeout)
+            results.append(result)
+            
+            if verbose:
+                self._print_test_result(result)
+        
+        return results
+    
+    def _run_threaded_tests(self, test_files: List[Path], max_parallel: int,
+                            timeout: int, verbose: bool) -> List[TestResult]:
+        """Run tests in parallel with one worker thread per running test.
+        
+        Worker threads spend their time launching children and draining their
+        output while holding the GIL, so more threads than CPUs only adds
+        contention. The single-threaded reaper path is not capped this way.
+        """
+        effective_parallel = min(max_parallel, os.cpu_count() or 1)
+        if verbose and effective_parallel != max_parallel:
+            print(f"Warning: limiting max_parallel from {max_parallel} to "
+                  f"{effective_parallel} (CPU count) for threaded execution")
+        
         results = []
+        executor = _get_pool(effective_parallel)
+        
+        # Submit all tests
+        future_to_test = {
+            executor.submit(self._run_single_test, test_file, timeout, verbose): test_file
+            for test_file in test_files
+        }
+        
+        # Collect results as they complete
+        for future in as_completed(future_to_test):
+            test_file = future_to_test[future]
+            try:
+                result = future.result()
+                results.append(result)
+                
+                if verbose:
+                    self._print_test_result(result)
+            except Exception as e:
+                # Handle unexpected errors
+                error_result = TestResult(
+                    test_file=str(test_file),
+                    success=False,
+                    output="",
+                    duration=0.0,
+                    exit_code=1,
+                    error_message=str(e)
+                )
+                results.append(error_result)
         
-        with ThreadPoolExecutor(max_workers=max_parallel) as executor:
-            # Submit all tests
-            future_to_test = {
-                executor.submit(self._run_single_test, test_file, timeout, verbose): test_file
-                for test_file in test_files
-            }
+        return results
+    
+    def _run_batched_tests(self, test_files: List[Path], max_parallel: int,
+                           timeout: int, verbose: bool) -> List[TestResult]:
+        """Run tests with several files per `bats` invocation.
+        
+        Files are split into up to ``max_parallel`` shards per directory, so the
+        process and bash start-up cost is paid once per shard rather than once
+        per file. Each shard's TAP output is mapped back to per-file results.
+        """
+        jobs = []
+        for shard in self._shard_test_files(test_files, max_parallel):
+            cmd = [_bats_executable() or 'bats', '--tap', *(str(test_file) for test_file in shard)]
+            if verbose:
+                print(f"Running: {' '.join(cmd)}")
+            jobs.append((shard, cmd, shard[0].parent, timeout * len(shard)))
+        
+        # Shards carry several files' output, so scale the cap accordingly
+        output_limit = _OUTPUT_LIMIT * max((len(job[0]) for job in jobs), default=1)
+        
+        results = []
+        reaper = _ProcessReaper(max_parallel, output_limit, env=self._child_env,
+                                keep_lines=_TAP_RESULT_RE)
+        for outcome in reaper.run(jobs):
+            for result in self._results_from_shard(outcome.key, outcome):
+                results.append(result)
+                
+                if verbose:
+                    self._print_test_result(result)
+        
+        return results
+    
+    def _shard_test_files(self, test_files: List[Path], shard_count: int) -> List[List[Path]]:
+        """Split test files into shards, never mixing files from different directories."""
+        by_dir: Dict[Path, List[Path]] = {}
+        for test_file in test_files:
+            by_dir.setdefault(test_file.parent, []).append(test_file)
+        
+        shards: List[List[Path]] = []
+        for dir_files in by_dir.values():
+            count = min(shard_count, len(dir_files))
+            shards.extend(dir_files[i::count] for i in range(count))
+        return shards
+    
+    def _results_from_shard(self, shard: List[Path], outcome: _ProcessOutcome) -> List[TestResult]:
+        """Map the TAP output of a batched `bats` run back to per-file results."""
+        if outcome.error is not None:
+            return [
+                TestResult(test_file=str(test_file), success=False, output="",
+                           duration=0.0, exit_code=1, error_message=outcome.error)
+                for test_file in shard
+            ]
+        
+        plan, cases = self._parse_tap_output(outcome.stdout)
+        counts = [self._count_tests(test_file) for test_file in shard]
+        total = sum(counts)
+        
+        if outcome.timed_out:
+            incomplete_message = f"Test timed out after {outcome.duration:.0f} seconds"
+        else:
+            incomplete_message = outcome.stderr or "BATS exited before running all tests"
+        
+        if plan is not None and plan != total:
+            # Tests are generated dynamically somewhere in the shard, so they
+            # cannot be attributed to files; report the shard as a whole
+            success = outcome.returncode == 0 and not outcome.timed_out
+            return [
+                TestResult(
+                    test_file=str(test_file),
+                    success=success,
+                    output=outcome.stdout,
+                    duration=outcome.duration / len(shard),
+                    exit_code=0 if success else 1,
+                    error_message=None if success else incomplete_message
+                )
+                for test_file in shard
+            ]
+        
+        results = []
+        offset = 0
+        for test_file, count in zip(shard, counts):
+            file_cases = cases[offset:offset + count]
+            offset += count
             
-            # Collect results as they complete
-            for future in as_completed(future_to_test):
-                test_file = future_to_test[future]
-                try:
-                    result = future.result()
-                    results.append(result)
-                    
-                    if verbose:
-                        self._print_test_result(result)
-                except Exception as e:
-                    # Handle unexpected errors
-                    error_result = TestResult(
-                        test_file=str(test_file),
-                        success=False,
-                        output="",
-                        duration=0.0,
-                        exit_code=1,
-                        error_message=str(e)
-                    )
-                    results.append(error_result)
+            complete = len(file_cases) == count
+            failures = [case for case in file_cases if not case[0]]
+            success = complete and not failures
+            
+            if success:
+                error_message = None
+            elif failures:
+                error_message = '\n'.join(line for case in failures for line in case[1])
+            else:
+                error_message = incomplete_message
+            
+            results.append(TestResult(
+                test_file=str(test_file),
+                success=success,
+                output='\n'.join(line for case in file_cases for line in case[1]),
+                duration=outcome.duration * count / total if total else 0.0,
+                exit_code=0 if success else 1,
+                error_message=error_message
+            ))
         
         return results
     
+    def _parse_tap_output(self, output: str) -> Tuple[Optional[int], List[Tuple[bool, List[str]]]]:
+        """Parse TAP output into the plan count and ``(passed, lines)`` per test case."""
+        plan = None
+        cases: List[Tuple[bool, List[str]]] = []
+        
+        for line in output.splitlines():
+            plan_match = _TAP_PLAN_RE.match(line)
+            if plan_match:
+                plan = int(plan_match.group(1))
+            elif line.startswith('ok '):
+                cases.append((True, [line]))
+            elif line.startswith('not ok '):
+                cases.append((False, [line]))
+            elif cases:
+                # Diagnostics and test output belong to the preceding test case
+                cases[-1][1].append(line)
+        
+        return plan, cases
+    
+    def _count_tests(self, test_file: Path) -> int:
+        """Count the @test cases declared in a BATS file."""
+        try:
+            return len(_BATS_TEST_RE.findall(test_file.read_bytes()))
+        except OSError:
+            return 0
+    
+    def _can_batch_tests(self) -> bool:
+        """Check whether several test files can share one `bats` invocation."""
+        if not _ProcessReaper.supported:
+            return False
+        version = _bats_version()
+        return version is not None and version >= _BATS_BATCH_MIN_VERSION
+    
     def _run_docker_tests(self, config: Dict[str, Any], test_files: List[Path], verbose: bool) -> List[TestResult]:
         """Run tests using Docker."""
         docker_config = config.get('docker', {})
@@ -189,8 +854,9 @@ class TestExecutor:
             generator.generate_docker_compose(config)
         
         # Run Docker Compose
+        from .docker_integration import compose_command
         try:
-            cmd = ['docker-compose', '-f', compose_file, 'up', '--build', '--abort-on-container-exit']
+            cmd = [*compose_command(), '-f', compose_file, 'up', '--build', '--abort-on-container-exit']
             
             if verbose:
                 print(f"Running Docker command: {' '.join(cmd)}")
@@ -199,7 +865,8 @@ class TestExecutor:
                 cmd,
                 capture_output=True,
                 text=True,
-                timeout=config.get('execution', {}).get('timeout', 300)
+                timeout=config.get('execution', {}).get('timeout', 300),
+                env=self._child_env
             )
             
             # Parse Docker output
@@ -243,17 +910,24 @@ class TestExecutor:
                 raise RuntimeError("BATS is not installed or not available in PATH")
             
             # Run the test
-            cmd = ['bats', str(test_file)]
+            cmd = [_bats_executable() or 'bats', str(test_file)]
             
             if verbose:
                 print(f"Running: {' '.join(cmd)}")
             
+            if _ProcessReaper.supported:
+                # Bounded, incrementally drained output instead of capture_output
+                [outcome] = _ProcessReaper(1, env=self._child_env).run(
+                    [(test_file, cmd, test_file.parent, timeout)])
+                return self._result_from_outcome(outcome, timeout)
+            
             result = subprocess.run(
                 cmd,
                 capture_output=True,
                 text=True,
                 timeout=timeout,
-                cwd=test_file.parent
+                cwd=test_file.parent,
+                env=self._child_env
             )
             
             duration = time.time() - start_time
@@ -288,13 +962,39 @@ class TestExecutor:
                 error_message=str(e)
             )
     
+    def _result_from_outcome(self, outcome: _ProcessOutcome, timeout: int) -> TestResult:
+        """Convert a reaped child process outcome into a test result."""
+        error_message: Optional[str]
+        if outcome.error is not None:
+            error_message = outcome.error
+        elif outcome.timed_out:
+            error_message = f"Test timed out after {timeout} seconds"
+        else:
+            error_message = outcome.stderr if outcome.returncode != 0 else None
+        
+        return TestResult(
+            test_file=str(outcome.key),
+            success=outcome.error is None and not outcome.timed_out and outcome.returncode == 0,
+            output="" if outcome.timed_out else outcome.stdout,
+            duration=outcome.duration,
+            exit_code=outcome.returncode,
+            error_message=error_message
+        )
+    
+    def _bats_unavailable_result(self, test_file: Path) -> TestResult:
+        """Result reported for a test that cannot run because BATS is missing."""
+        return TestResult(
+            test_file=str(test_file),
+            success=False,
+            output="",
+            duration=0.0,
+            exit_code=1,
+            error_message="BATS is not installed or not available in PATH"
+        )
+    
     def _check_bats_available(self) -> bool:
         """Check if BATS is available in the system."""
-        try:
-            result = subprocess.run(['bats', '--version'], capture_output=True, text=True)
-            return result.returncode == 0
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return False
+        return _bats_version() is not None
     
     def _print_test_result(self, result: TestResult) -> None:
         """Print test result to console."""
@@ -323,56 +1023,62 @@ class TestExecutor:
                 self._print_console_report(results)
     
     def _generate_json_report(self, results: ExecutionResults, output_dir: Path) -> None:
-        """Generate JSON report."""
-        report_data = {
-            'summary': {
-                'total_tests': results.total_tests,
-                'passed_tests': results.passed_tests,
-                'failed_tests': results.failed_tests,
-                'total_duration': results.total_duration,
-                'success': results.success
-            },
-            'results': [
-                {
+        """Generate JSON report.
+        
+        Results are encoded and written one at a time, so peak memory does not
+        grow with a second copy of every result.
+        """
+        summary = {
+            'total_tests': results.total_tests,
+            'passed_tests': results.passed_tests,
+            'failed_tests': results.failed_tests,
+            'total_duration': results.total_duration,
+            'success': results.success
+        }
+        
+        report_file = output_dir / 'test-report.json'
+        with open(report_file, 'wb') as f:
+            f.write(b'{\n  "summary": ')
+            f.write(_json_indented(summary, b'\n  '))
+            f.write(b',\n  "results": [')
+            separator = b'\n    '
+            for r in results.results:
+                f.write(separator)
+                f.write(_json_indented({
                     'test_file': r.test_file,
                     'success': r.success,
                     'duration': r.duration,
                     'exit_code': r.exit_code,
                     'error_message': r.error_message
-                }
-                for r in results.results
-            ]
-        }
-        
-        report_file = output_dir / 'test-report.json'
-        with open(report_file, 'w') as f:
-            json.dump(report_data, f, indent=2)
+                }, b'\n    '))
+                separator = b',\n    '
+            f.write(b'\n  ]\n}' if results.results else b']\n}')
     
     def _generate_junit_report(self, results: ExecutionResults, output_dir: Path) -> None:
         """Generate JUnit XML report."""
-        # Simplified JUnit XML generation
-        xml_content = f'''<?xml version="1.0" encoding="UTF-8"?>
-<testsuite name="BATMAN API Tests" tests="{results.total_tests}" failures="{results.failed_tests}" time="{results.total_duration:.2f}">
-'''
+        suite = ET.Element('testsuite', {
+            'name': 'BATMAN API Tests',
+            'tests': str(results.total_tests),
+            'failures': str(results.failed_tests),
+            'time': f"{results.total_duration:.2f}",
+        })
         
         for result in results.results:
-            test_name = Path(result.test_file).stem
-            xml_content += f'  <testcase name="{test_name}" time="{result.duration:.2f}">\n'
+            testcase = ET.SubElement(suite, 'testcase', name=Path(result.test_file).stem,
+                                     time=f"{result.duration:.2f}")
             
             if not result.success:
-                xml_content += f'    <failure message="{result.error_message or "Test failed"}"/>\n'
-            
-            xml_content += '  </testcase>\n'
-        
-        xml_content += '</testsuite>'
+                failure = ET.SubElement(testcase, 'failure',
+                                        message=result.error_message or "Test failed")
+                failure.text = result.error_message
         
+        # ElementTree handles escaping of names and error output
         report_file = output_dir / 'test-report.xml'
-        with open(report_file, 'w') as f:
-            f.write(xml_content)
+        ET.ElementTree(suite).write(report_file, encoding='utf-8', xml_declaration=True)
     
     def _generate_html_report(self, results: ExecutionResults, output_dir: Path) -> None:
         """Generate HTML report."""
-        html_content = f'''
+        parts = [f'''
 <!DOCTYPE html>
 <html>
 <head>
@@ -397,30 +1103,31 @@ class TestExecutor:
         <p>Duration: {results.total_duration:.2f}s</p>
     </div>
     <h2>Test Results</h2>
-'''
+''']
+        append = parts.append
         
         for result in results.results:
             status_class = "pass" if result.success else "fail"
-            html_content += f'''
+            append(f'''
     <div class="test-result {status_class}">
-        <h3>{Path(result.test_file).name}</h3>
+        <h3>{html.escape(Path(result.test_file).name)}</h3>
         <p>Duration: {result.duration:.2f}s</p>
         <p>Status: {"PASS" if result.success else "FAIL"}</p>
-'''
+''')
             
             if not result.success and result.error_message:
-                html_content += f'        <p>Error: {result.error_message}</p>\n'
+                append(f'        <p>Error: {html.escape(result.error_message)}</p>\n')
             
-            html_content += '    </div>\n'
+            append('    </div>\n')
         
-        html_content += '''
+        append('''
 </body>
 </html>
-'''
+''')
         
         report_file = output_dir / 'test-report.html'
         with open(report_file, 'w') as f:
-            f.write(html_content)
+            f.writelines(parts)
     
     def _print_console_report(self, results: ExecutionResults) -> None:
         """Print console report."""
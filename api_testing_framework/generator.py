@@ -2,20 +2,67 @@
 Test generator for creating BATS tests from OpenAPI specifications.
 """
 
+import functools
 import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from .parser import OpenAPIParser, Endpoint
-from .templates import TemplateEngine
+from .templates import get_template_engine
 from .config import ConfigManager
 
 
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+
+
+def _write_file(path: Path, content: str, mode: Optional[int] = None) -> None:
+    """Write content to path, optionally setting its mode through the open descriptor.
+    
+    Without a mode the file gets the umask default, as with open(). A mode
+    given to os.open() only applies to new files and is masked by the umask,
+    so it is set again with fchmod where available.
+    """
+    data = content.encode('utf-8')
+    fd = os.open(os.fspath(path), _WRITE_FLAGS, 0o666 if mode is None else mode)
+    try:
+        if mode is not None and hasattr(os, 'fchmod'):
+            os.fchmod(fd, mode)
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+# Below this many tag files, worker start-up costs more than rendering in-process
+_PARALLEL_RENDER_MIN_TAGS = 8
+
+
+@functools.lru_cache(maxsize=1)
+def _render_pool() -> ProcessPoolExecutor:
+    """Get the process pool used to render per-tag test files, creating it on first use."""
+    return ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+
+
+def _render_tag_tests(template_file: str, base_context: Dict[str, Any],
+                      jobs: List[Tuple[str, List[Endpoint], Path]]) -> None:
+    """Render and write the test files for a batch of tags.
+    
+    Runs in pool workers, so it uses the worker's own template engine.
+    """
+    template_engine = get_template_engine()
+    for tag, tag_endpoints, test_file in jobs:
+        context = dict(base_context, endpoints=tag_endpoints, tag=tag)
+        _write_file(test_file, template_engine.render_template(template_file, context), 0o755)
+
+
 class TestGenerator:
     """Generates BATS tests from OpenAPI specifications."""
     
     def __init__(self):
         self.parser = OpenAPIParser()
-        self.template_engine = TemplateEngine()
+        self.template_engine = get_template_engine()
         self.config_manager = ConfigManager()
     
     def generate_tests(self, spec: Dict[str, Any], config: Dict[str, Any]) -> None:
@@ -51,11 +98,14 @@ class TestGenerator:
     
     def _filter_endpoints(self, endpoints: List[Endpoint], exclude: List[str], include_only: List[str]) -> List[Endpoint]:
         """Filter endpoints based on configuration."""
+        # Exact path matches, so one hash lookup per endpoint
         if include_only:
-            return [ep for ep in endpoints if ep.path in include_only]
+            include_set = frozenset(include_only)
+            return [ep for ep in endpoints if ep.path in include_set]
         
         if exclude:
-            return [ep for ep in endpoints if ep.path not in exclude]
+            exclude_set = frozenset(exclude)
+            return [ep for ep in endpoints if ep.path not in exclude_set]
         
         return endpoints
     
@@ -66,12 +116,8 @@ class TestGenerator:
             'target_api': config.get('target_api', {})
         })
         
-        helpers_file = output_dir / 'helpers.bash'
-        with open(helpers_file, 'w') as f:
-            f.write(helpers_content)
-        
-        # Make helpers executable
-        os.chmod(helpers_file, 0o755)
+        # Helpers are created executable
+        _write_file(output_dir / 'helpers.bash', helpers_content, 0o755)
     
     def _generate_template_tests(self, template_name: str, endpoints: List[Endpoint], 
                                 schemas: Dict[str, Any], config: Dict[str, Any], output_dir: Path) -> None:
@@ -79,32 +125,35 @@ class TestGenerator:
         template_file = f"{template_name}.bats.j2"
         
         # Group endpoints by tag for better organization
-        endpoints_by_tag = {}
+        endpoints_by_tag: Dict[str, List[Endpoint]] = defaultdict(list)
         for endpoint in endpoints:
-            for tag in endpoint.tags or ['default']:
-                if tag not in endpoints_by_tag:
-                    endpoints_by_tag[tag] = []
+            for tag in endpoint.tags or ('default',):
                 endpoints_by_tag[tag].append(endpoint)
         
-        # Generate test files for each tag
-        for tag, tag_endpoints in endpoints_by_tag.items():
-            context = {
-                'endpoints': tag_endpoints,
-                'schemas': schemas,
-                'api': config.get('api', {}),
-                'target_api': config.get('target_api', {}),
-                'tag': tag
-            }
-            
-            test_content = self.template_engine.render_template(template_file, context)
-            
-            # Create test file
-            test_file = output_dir / f"{template_name}_{self.template_engine._to_snake_case(tag)}.bats"
-            with open(test_file, 'w') as f:
-                f.write(test_content)
-            
-            # Make test file executable
-            os.chmod(test_file, 0o755)
+        to_snake_case = self.template_engine._to_snake_case
+        jobs = [
+            (tag, tag_endpoints, output_dir / f"{template_name}_{to_snake_case(tag)}.bats")
+            for tag, tag_endpoints in endpoints_by_tag.items()
+        ]
+        base_context = {
+            'schemas': schemas,
+            'api': config.get('api', {}),
+            'target_api': config.get('target_api', {})
+        }
+        
+        workers = min(os.cpu_count() or 1, len(jobs))
+        if len(jobs) < _PARALLEL_RENDER_MIN_TAGS or workers < 2:
+            _render_tag_tests(template_file, base_context, jobs)
+            return
+        
+        # One batch per worker so the shared schemas are pickled once per worker, not per tag
+        pool = _render_pool()
+        futures = [
+            pool.submit(_render_tag_tests, template_file, base_context, jobs[i::workers])
+            for i in range(workers)
+        ]
+        for future in futures:
+            future.result()
     
     def _copy_custom_test(self, custom_test_path: str, output_dir: Path) -> None:
         """Copy custom test file to output directory."""
@@ -129,9 +178,7 @@ class TestGenerator:
         
         compose_content = self.template_engine.render_template('docker-compose.yml.j2', context)
         
-        compose_file = Path('docker-compose.yml')
-        with open(compose_file, 'w') as f:
-            f.write(compose_content)
+        _write_file(Path('docker-compose.yml'), compose_content)
     
     def generate_test_data_templates(self, schemas: Dict[str, Any], output_dir: Path) -> None:
         """Generate test data templates for schemas."""
@@ -146,6 +193,4 @@ class TestGenerator:
             
             test_data_content = self.template_engine.render_template('test-data.json.j2', context)
             
-            test_data_file = test_data_dir / f"{schema_name}.json"
-            with open(test_data_file, 'w') as f:
-                f.write(test_data_content)
+            _write_file(test_data_dir / f"{schema_name}.json", test_data_content)
@@ -3,20 +3,116 @@ OpenAPI specification parser for BATMAN API Testing Framework.
 """
 
 import json
+import os
+import re
 import yaml
 import requests
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional, Set, Tuple
 from dataclasses import dataclass
 from urllib.parse import urlparse
 import git
 import tempfile
 import shutil
 
+from .config import get_http_session
+
+try:
+    from yaml import CSafeLoader as _Loader
+    _LIBYAML = True
+except ImportError:
+    from yaml import SafeLoader as _Loader  # type: ignore[assignment]
+    _LIBYAML = False
+
+_libyaml_warned = False
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_HTTP_METHODS = frozenset(['get', 'post', 'put', 'patch', 'delete', 'head', 'options'])
+
+# First digit of an HTTP status code -> its class
+_STATUS_CLASS = {
+    '1': 'info', '2': 'success', '3': 'redirect', '4': 'client_error', '5': 'server_error'
+}
+_ERROR_CLASSES = frozenset(['client_error', 'server_error'])
+
+# Error from a git too old for the sparse/partial clone options, e.g. "error: unknown option `sparse'"
+_SPARSE_CLONE_REJECTED_RE = re.compile(r"unknown option .(?:sparse|filter)\b")
+
+
+def _load_yaml(content: bytes) -> Any:
+    """Parse YAML with the libyaml-backed loader when PyYAML was built with it."""
+    global _libyaml_warned
+    if not _LIBYAML and not _libyaml_warned:
+        _libyaml_warned = True
+        print("Warning: PyYAML was built without libyaml; large specs will parse slowly")
+    return yaml.load(content, Loader=_Loader)
+
+
+def _json_loads(data: bytes) -> Any:
+    """Parse JSON with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize to JSON bytes with orjson when it is installed.
+    
+    Like json.dumps, dates are rejected rather than written as strings.
+    """
+    if orjson is not None:
+        encoded: bytes = orjson.dumps(obj, option=orjson.OPT_PASSTHROUGH_DATETIME)
+        return encoded
+    return json.dumps(obj).encode()
+
+
+def _has_only_str_keys(obj: Any) -> bool:
+    """Check that every mapping nested in obj is keyed by strings.
+    
+    JSON stringifies other keys (YAML's ``200:`` is an int), so such
+    documents would not round-trip through a JSON cache unchanged.
+    """
+    stack = [obj]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if not all(isinstance(key, str) for key in node):
+                return False
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return True
+
+
+def _parse_spec_bytes(data: bytes) -> Any:
+    """Parse a raw OpenAPI document, trying JSON before YAML.
+    
+    JSON is valid YAML, so JSON specs served or saved as YAML still parse,
+    just without going through the much slower YAML parser.
+    """
+    try:
+        return _json_loads(data)
+    except json.JSONDecodeError:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        return _load_yaml(data)
+
+
+def _status_class(status_code: Any) -> Optional[str]:
+    """Get the class of a response status code, which YAML may load as an int."""
+    return _STATUS_CLASS.get(str(status_code)[:1])
+
 
 @dataclass
 class Endpoint:
     """Represents an API endpoint."""
+    # Declared by hand as dataclass(slots=True) needs Python 3.10
+    __slots__ = ('path', 'method', 'operation_id', 'summary', 'description',
+                 'parameters', 'request_body', 'responses', 'tags', 'security')
+    
     path: str
     method: str
     operation_id: Optional[str]
@@ -27,11 +123,24 @@ class Endpoint:
     responses: Dict[str, Dict[str, Any]]
     tags: List[str]
     security: List[Dict[str, Any]]
+    
+    def classify_responses(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Group responses into success, client and server error buckets in one pass."""
+        classes: Dict[str, Dict[str, Dict[str, Any]]] = {
+            'success': {}, 'client_error': {}, 'server_error': {}
+        }
+        for status_code, response_def in self.responses.items():
+            bucket = classes.get(_status_class(status_code) or '')
+            if bucket is not None:
+                bucket[status_code] = response_def
+        return classes
 
 
 @dataclass
 class Schema:
     """Represents a JSON schema."""
+    __slots__ = ('name', 'schema', 'required_fields', 'properties')
+    
     name: str
     schema: Dict[str, Any]
     required_fields: List[str]
@@ -42,10 +151,7 @@ class OpenAPIParser:
     """Parses OpenAPI specifications from various sources."""
     
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'BATMAN-API-Testing-Framework/1.0.0'
-        })
+        self.session = get_http_session()
     
     def fetch_and_parse(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """Fetch and parse OpenAPI specification based on configuration."""
@@ -54,7 +160,8 @@ class OpenAPIParser:
         if 'spec_url' in openapi_config:
             return self._fetch_from_url(openapi_config['spec_url'])
         elif 'spec_file' in openapi_config:
-            return self._fetch_from_file(openapi_config['spec_file'])
+            return self._fetch_from_file(openapi_config['spec_file'],
+                                         cache=openapi_config.get('cache_spec', False))
         elif 'spec_git' in openapi_config:
             return self._fetch_from_git(openapi_config['spec_git'])
         else:
@@ -66,35 +173,54 @@ class OpenAPIParser:
             response = self.session.get(url, timeout=30)
             response.raise_for_status()
             
-            content_type = response.headers.get('content-type', '').lower()
-            if 'application/json' in content_type:
-                return response.json()
-            elif 'application/yaml' in content_type or 'text/yaml' in content_type:
-                return yaml.safe_load(response.text)
-            else:
-                # Try to parse as JSON first, then YAML
-                try:
-                    return response.json()
-                except json.JSONDecodeError:
-                    return yaml.safe_load(response.text)
+            return _parse_spec_bytes(response.content)
         
         except requests.RequestException as e:
             raise ValueError(f"Failed to fetch OpenAPI spec from URL: {e}")
     
-    def _fetch_from_file(self, file_path: str) -> Dict[str, Any]:
+    def _fetch_from_file(self, file_path: str, cache: bool = False) -> Dict[str, Any]:
         """Fetch OpenAPI specification from local file."""
-        file_path = Path(file_path)
-        if not file_path.exists():
-            raise FileNotFoundError(f"OpenAPI spec file not found: {file_path}")
+        spec_file = Path(file_path)
+        if not spec_file.exists():
+            raise FileNotFoundError(f"OpenAPI spec file not found: {spec_file}")
         
-        with open(file_path, 'r') as f:
-            content = f.read()
+        # JSON specs already parse quickly; only YAML is worth caching
+        if not cache or spec_file.suffix.lower() == '.json':
+            return _parse_spec_bytes(spec_file.read_bytes())
         
-        # Try to parse as JSON first, then YAML
+        stat = spec_file.stat()
+        source = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+        cache_file = spec_file.with_suffix(spec_file.suffix + '.cache.json')
         try:
-            return json.loads(content)
-        except json.JSONDecodeError:
-            return yaml.safe_load(content)
+            cached = _json_loads(cache_file.read_bytes())
+            if cached.get('source') == source:
+                return cached['spec']
+        except (OSError, ValueError, AttributeError, KeyError):
+            pass
+        
+        spec = _parse_spec_bytes(spec_file.read_bytes())
+        self._write_spec_cache(cache_file, source, spec)
+        return spec
+    
+    def _write_spec_cache(self, cache_file: Path, source: Dict[str, int], spec: Any) -> None:
+        """Atomically write a parsed spec beside its source.
+        
+        Caching is best effort; unwritable directories and values JSON cannot
+        represent (such as YAML timestamps or non-string keys) leave the spec
+        uncached.
+        """
+        if not _has_only_str_keys(spec):
+            return
+        
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        try:
+            tmp_file.write_bytes(_json_dumps({'source': source, 'spec': spec}))
+            os.replace(tmp_file, cache_file)
+        except (OSError, TypeError, ValueError):
+            try:
+                tmp_file.unlink()
+            except OSError:
+                pass
     
     def _fetch_from_git(self, git_config: Dict[str, Any]) -> Dict[str, Any]:
         """Fetch OpenAPI specification from Git repository."""
@@ -111,49 +237,90 @@ class OpenAPIParser:
                     parsed_url = urlparse(repo_url)
                     repo_url = f"{parsed_url.scheme}://{token}@{parsed_url.netloc}{parsed_url.path}"
                 
-                # Clone repository
-                repo = git.Repo.clone_from(repo_url, temp_dir, branch=branch)
+                # Clone only the latest commit, checking out just the spec's directory
+                self._clone_sparse(repo_url, temp_dir, branch, spec_path)
                 
                 # Read spec file
                 spec_file = Path(temp_dir) / spec_path
                 if not spec_file.exists():
                     raise FileNotFoundError(f"OpenAPI spec file not found in repository: {spec_path}")
                 
-                with open(spec_file, 'r') as f:
-                    content = f.read()
-                
-                # Try to parse as JSON first, then YAML
-                try:
-                    return json.loads(content)
-                except json.JSONDecodeError:
-                    return yaml.safe_load(content)
+                return _parse_spec_bytes(spec_file.read_bytes())
             
             except git.GitCommandError as e:
                 raise ValueError(f"Failed to clone Git repository: {e}")
     
+    def _clone_sparse(self, repo_url: str, target_dir: str, branch: str, spec_path: str) -> None:
+        """Shallow, blobless clone with a sparse checkout of the spec's directory.
+        
+        Falls back to a full clone when the local git is too old for
+        ``--sparse`` (git < 2.25) or rejects the partial clone filter; other
+        clone failures, such as a bad URL or branch, are raised as is.
+        """
+        try:
+            repo = git.Repo.clone_from(repo_url, target_dir, branch=branch, depth=1,
+                                       multi_options=['--filter=blob:none', '--sparse'])
+        except git.GitCommandError as e:
+            if not _SPARSE_CLONE_REJECTED_RE.search(str(e.stderr)):
+                raise
+            for leftover in Path(target_dir).iterdir():
+                if leftover.is_dir():
+                    shutil.rmtree(leftover, ignore_errors=True)
+                else:
+                    leftover.unlink()
+            git.Repo.clone_from(repo_url, target_dir, branch=branch)
+            return
+        
+        # Top-level files are always checked out in cone mode
+        spec_dir = Path(spec_path).parent.as_posix()
+        if spec_dir != '.':
+            repo.git.sparse_checkout('set', spec_dir)
+    
     def parse_endpoints(self, spec: Dict[str, Any]) -> List[Endpoint]:
         """Parse endpoints from OpenAPI specification."""
+        return [
+            self._endpoint_from_operation(path, method, operation)
+            for path, method, operation in self._iter_operations(spec)
+        ]
+    
+    def parse_all(self, spec: Dict[str, Any]) -> Tuple[List[Endpoint], Dict[str, Schema],
+                                                       Dict[Tuple[str, str], List[Dict[str, Any]]]]:
+        """Parse endpoints, schemas and per-endpoint test cases in one pass.
+        
+        Test cases are keyed by ``(method, path)``.
+        """
         endpoints = []
-        paths = spec.get('paths', {})
+        test_cases = {}
         
-        for path, path_item in paths.items():
+        for path, method, operation in self._iter_operations(spec):
+            endpoint = self._endpoint_from_operation(path, method, operation)
+            endpoints.append(endpoint)
+            test_cases[(endpoint.method, path)] = self._build_test_cases(
+                endpoint.method, path, endpoint.responses)
+        
+        return endpoints, self.extract_schemas(spec), test_cases
+    
+    def _iter_operations(self, spec: Dict[str, Any]) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        """Yield ``(path, method, operation)`` for every HTTP operation in the spec."""
+        for path, path_item in spec.get('paths', {}).items():
             for method, operation in path_item.items():
-                if method.lower() in ['get', 'post', 'put', 'patch', 'delete', 'head', 'options']:
-                    endpoint = Endpoint(
-                        path=path,
-                        method=method.upper(),
-                        operation_id=operation.get('operationId'),
-                        summary=operation.get('summary'),
-                        description=operation.get('description'),
-                        parameters=operation.get('parameters', []),
-                        request_body=operation.get('requestBody'),
-                        responses=operation.get('responses', {}),
-                        tags=operation.get('tags', []),
-                        security=operation.get('security', [])
-                    )
-                    endpoints.append(endpoint)
-        
-        return endpoints
+                if method.lower() in _HTTP_METHODS:
+                    yield path, method, operation
+    
+    def _endpoint_from_operation(self, path: str, method: str, operation: Dict[str, Any]) -> Endpoint:
+        """Build an Endpoint from an OpenAPI operation object."""
+        return Endpoint(
+            path=path,
+            method=method.upper(),
+            operation_id=operation.get('operationId'),
+            summary=operation.get('summary'),
+            description=operation.get('description'),
+            parameters=operation.get('parameters', []),
+            request_body=operation.get('requestBody'),
+            responses=operation.get('responses', {}),
+            tags=operation.get('tags', []),
+            security=operation.get('security', [])
+        )
     
     def extract_schemas(self, spec: Dict[str, Any]) -> Dict[str, Schema]:
         """Extract schemas from OpenAPI specification."""
@@ -173,29 +340,61 @@ class OpenAPIParser:
         return schemas
     
     def resolve_refs(self, spec: Dict[str, Any]) -> Dict[str, Any]:
-        """Resolve $ref references in OpenAPI specification."""
-        def resolve_ref(obj, spec_root):
-            if isinstance(obj, dict):
-                if '$ref' in obj:
+        """Resolve $ref references in OpenAPI specification.
+        
+        Internal references are replaced by their targets. Subtrees without
+        any reference are shared with the input rather than copied, and each
+        distinct reference or shared subtree is resolved only once.
+        """
+        ref_cache: Dict[str, Any] = {}
+        # id() of each visited container -> its resolved replacement
+        resolved: Dict[int, Any] = {}
+        visiting: Set[int] = set()
+        stack: List[Tuple[Any, bool]] = [(spec, False)]
+        
+        while stack:
+            obj, children_done = stack.pop()
+            obj_id = id(obj)
+            if obj_id in resolved:
+                continue
+            
+            if not children_done:
+                if isinstance(obj, dict) and '$ref' in obj:
                     ref_path = obj['$ref']
                     if ref_path.startswith('#'):
                         # Internal reference
-                        path_parts = ref_path[2:].split('/')
-                        resolved = spec_root
-                        for part in path_parts:
-                            resolved = resolved[part]
-                        return resolved
+                        if ref_path not in ref_cache:
+                            target = spec
+                            for part in ref_path[2:].split('/'):
+                                target = target[part]
+                            ref_cache[ref_path] = target
+                        resolved[obj_id] = ref_cache[ref_path]
                     else:
                         # External reference - simplified handling
-                        return obj
-                else:
-                    return {k: resolve_ref(v, spec_root) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [resolve_ref(item, spec_root) for item in obj]
+                        resolved[obj_id] = obj
+                    continue
+                
+                visiting.add(obj_id)
+                stack.append((obj, True))
+                children = obj.values() if isinstance(obj, dict) else obj
+                for child in children:
+                    child_id = id(child)
+                    if (isinstance(child, (dict, list)) and child_id not in resolved
+                            and child_id not in visiting):
+                        stack.append((child, False))
+                continue
+            
+            visiting.discard(obj_id)
+            if isinstance(obj, dict):
+                items = [(k, resolved.get(id(v), v)) for k, v in obj.items()]
+                changed = any(new is not old for (_, new), old in zip(items, obj.values()))
+                resolved[obj_id] = dict(items) if changed else obj
             else:
-                return obj
+                values = [resolved.get(id(v), v) for v in obj]
+                changed = any(new is not old for new, old in zip(values, obj))
+                resolved[obj_id] = values if changed else obj
         
-        return resolve_ref(spec, spec)
+        return resolved.get(id(spec), spec)
     
     def validate_spec(self, spec: Dict[str, Any]) -> bool:
         """Validate OpenAPI specification structure."""
@@ -219,37 +418,44 @@ class OpenAPIParser:
     
     def get_endpoint_test_cases(self, endpoint: Endpoint) -> List[Dict[str, Any]]:
         """Generate test cases for an endpoint."""
-        test_cases = []
+        return self._build_test_cases(endpoint.method, endpoint.path, endpoint.responses)
+    
+    def _build_test_cases(self, method: str, path: str,
+                          responses: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Generate test cases from an operation's responses.
         
-        # Basic success test case
-        success_response = None
-        for status_code, response_def in endpoint.responses.items():
-            if status_code.startswith('2'):
-                success_response = response_def
-                break
+        The first 2xx response gives the success case, which is listed
+        before one error case per 4xx/5xx response.
+        """
+        success_case = None
+        test_cases = []
         
-        if success_response:
+        for status_code, response_def in responses.items():
+            status_class = _status_class(status_code)
+            if status_class == 'success':
+                if success_case is not None:
+                    continue
+                test_type = 'success'
+                name = f"{method} {path} returns {response_def.get('description', 'success')}"
+            elif status_class in _ERROR_CLASSES:
+                test_type = 'error'
+                name = f"{method} {path} returns {status_code}"
+            else:
+                continue
+            
             test_case = {
-                'name': f"{endpoint.method} {endpoint.path} returns {success_response.get('description', 'success')}",
-                'method': endpoint.method,
-                'path': endpoint.path,
+                'name': name,
+                'method': method,
+                'path': path,
                 'expected_status': int(status_code),
-                'response_schema': success_response.get('content', {}).get('application/json', {}).get('schema'),
-                'test_type': 'success'
+                'response_schema': response_def.get('content', {}).get('application/json', {}).get('schema'),
+                'test_type': test_type
             }
-            test_cases.append(test_case)
-        
-        # Error test cases
-        for status_code, response_def in endpoint.responses.items():
-            if status_code.startswith('4') or status_code.startswith('5'):
-                test_case = {
-                    'name': f"{endpoint.method} {endpoint.path} returns {status_code}",
-                    'method': endpoint.method,
-                    'path': endpoint.path,
-                    'expected_status': int(status_code),
-                    'response_schema': response_def.get('content', {}).get('application/json', {}).get('schema'),
-                    'test_type': 'error'
-                }
+            if test_type == 'success':
+                success_case = test_case
+            else:
                 test_cases.append(test_case)
         
+        if success_case is not None:
+            test_cases.insert(0, success_case)
         return test_cases
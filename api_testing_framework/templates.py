@@ -2,12 +2,38 @@
 Template engine for generating BATS tests from OpenAPI specifications.
 """
 
+import functools
 import os
+import re
 from pathlib import Path
-from typing import Dict, Any, List
-from jinja2 import Environment, FileSystemLoader, Template
+from typing import Dict, Any, List, Optional, Tuple
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+from .config import cache_dir
 from .parser import Endpoint, Schema
 
+_SNAKE_RE_1 = re.compile(r'(.)([A-Z][a-z]+)')
+_SNAKE_RE_2 = re.compile(r'([a-z0-9])([A-Z])')
+_PATH_PARAM_RE = re.compile(r'\{([^}]+)\}')
+
+
+@functools.lru_cache(maxsize=4096)
+def _extract_path_params_cached(path: str) -> Tuple[str, ...]:
+    """Extract path parameters, memoized since one path serves several methods."""
+    return tuple(_PATH_PARAM_RE.findall(path))
+
+
+def _bytecode_cache() -> Optional[FileSystemBytecodeCache]:
+    """Get the on-disk cache of compiled templates, shared across runs.
+    
+    Caching is best effort; an unwritable cache directory disables it.
+    """
+    jinja_dir = cache_dir() / "jinja"
+    try:
+        jinja_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+    except OSError:
+        return None
+    return FileSystemBytecodeCache(directory=str(jinja_dir))
+
 
 class TemplateEngine:
     """Jinja2-based template engine for test generation."""
@@ -20,30 +46,32 @@ class TemplateEngine:
         self.env = Environment(
             loader=FileSystemLoader(str(self.template_dir)),
             trim_blocks=True,
-            lstrip_blocks=True
+            lstrip_blocks=True,
+            bytecode_cache=_bytecode_cache(),
+            auto_reload=False
         )
+        # Loaded templates by name, skipping Jinja's loader lookup on repeat renders
+        self._template_cache: Dict[str, Template] = {}
         
         # Add custom filters
         self.env.filters['to_snake_case'] = self._to_snake_case
         self.env.filters['to_camel_case'] = self._to_camel_case
-        self.env.filters['extract_path_params'] = self._extract_path_params
+        self.env.filters['extract_path_params'] = _extract_path_params_cached
         self.env.filters['generate_test_data'] = self._generate_test_data
     
     def _to_snake_case(self, text: str) -> str:
         """Convert text to snake_case."""
-        import re
-        s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', text)
-        return re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1).lower()
+        s1 = _SNAKE_RE_1.sub(r'\1_\2', text)
+        return _SNAKE_RE_2.sub(r'\1_\2', s1).lower()
     
     def _to_camel_case(self, text: str) -> str:
         """Convert text to camelCase."""
         components = text.split('_')
         return components[0] + ''.join(x.title() for x in components[1:])
     
-    def _extract_path_params(self, path: str) -> List[str]:
+    def _extract_path_params(self, path: str) -> Tuple[str, ...]:
         """Extract path parameters from OpenAPI path."""
-        import re
-        return re.findall(r'\{([^}]+)\}', path)
+        return _extract_path_params_cached(path)
     
     def _generate_test_data(self, schema: Dict[str, Any]) -> Dict[str, Any]:
         """Generate test data based on schema."""
@@ -81,7 +109,9 @@ class TemplateEngine:
     
     def render_template(self, template_name: str, context: Dict[str, Any]) -> str:
         """Render a template with the given context."""
-        template = self.env.get_template(template_name)
+        template = self._template_cache.get(template_name)
+        if template is None:
+            template = self._template_cache[template_name] = self.env.get_template(template_name)
         return template.render(**context)
     
     def get_available_templates(self) -> List[str]:
@@ -90,6 +120,7 @@ class TemplateEngine:
     
     def create_endpoint_context(self, endpoint: Endpoint, api_config: Dict[str, Any]) -> Dict[str, Any]:
         """Create template context for an endpoint."""
+        response_classes = endpoint.classify_responses()
         return {
             'endpoint': endpoint,
             'api': api_config.get('api', {}),
@@ -97,8 +128,9 @@ class TemplateEngine:
             'path_params': self._extract_path_params(endpoint.path),
             'has_request_body': endpoint.request_body is not None,
             'has_parameters': len(endpoint.parameters) > 0,
-            'success_responses': {k: v for k, v in endpoint.responses.items() if k.startswith('2')},
-            'error_responses': {k: v for k, v in endpoint.responses.items() if k.startswith('4') or k.startswith('5')}
+            'success_responses': response_classes['success'],
+            'error_responses': {**response_classes['client_error'],
+                                **response_classes['server_error']}
         }
     
     def create_schema_context(self, schema: Schema, api_config: Dict[str, Any]) -> Dict[str, Any]:
@@ -108,3 +140,13 @@ class TemplateEngine:
             'api': api_config.get('api', {}),
             'test_data': self._generate_test_data(schema.schema)
         }
+
+
+@functools.lru_cache(maxsize=1)
+def get_template_engine() -> TemplateEngine:
+    """Get the process-wide engine for the bundled templates.
+    
+    Reusing one engine keeps Jinja's compiled-template cache warm, so each
+    template is compiled once per process rather than once per generator.
+    """
+    return TemplateEngine()
@@ -2,11 +2,88 @@
 Validation system for BATMAN API Testing Framework.
 """
 
+import functools
 import json
+import re
 import jsonschema
-from typing import Dict, Any, List, Optional, Union
+from typing import Callable, Dict, Any, List, Optional, Pattern, Tuple
 from dataclasses import dataclass
 
+_TYPE_MAP = {'str': str, 'int': int, 'float': float, 'bool': bool, 'list': list, 'dict': dict}
+
+
+def _type_matches(value: Any, expected_type: str) -> bool:
+    """Check a value against a type name such as 'int' or 'str'."""
+    expected_cls = _TYPE_MAP.get(expected_type)
+    if expected_cls is None:
+        # Names outside the map keep the exact type-name comparison
+        return type(value).__name__ == expected_type
+    # bool subclasses int, but a JSON true is not an integer
+    if isinstance(value, bool) and expected_cls is not bool:
+        return False
+    return isinstance(value, expected_cls)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_pattern(pattern: str) -> Pattern[str]:
+    """Compile a string_pattern rule once and reuse it across validations."""
+    return re.compile(pattern)
+
+
+def _check_required_fields(data: Dict[str, Any], fields: List[str], errors: List[str]) -> None:
+    """Report fields missing from data."""
+    for field in fields:
+        if field not in data:
+            errors.append(f"Required field '{field}' is missing")
+
+
+def _check_field_types(data: Dict[str, Any], field_types: Dict[str, str], errors: List[str]) -> None:
+    """Report fields whose value is not of the expected type."""
+    for field, expected_type in field_types.items():
+        if field in data and not _type_matches(data[field], expected_type):
+            errors.append(f"Field '{field}' should be {expected_type}, got {type(data[field]).__name__}")
+
+
+def _check_value_ranges(data: Dict[str, Any], value_ranges: Dict[str, Dict[str, Any]],
+                        errors: List[str]) -> None:
+    """Report numeric fields outside their min/max bounds."""
+    for field, range_config in value_ranges.items():
+        if field in data:
+            value = data[field]
+            if isinstance(value, (int, float)):
+                min_val = range_config.get('min')
+                max_val = range_config.get('max')
+                if min_val is not None and value < min_val:
+                    errors.append(f"Field '{field}' value {value} is below minimum {min_val}")
+                if max_val is not None and value > max_val:
+                    errors.append(f"Field '{field}' value {value} is above maximum {max_val}")
+
+
+def _check_string_patterns(data: Dict[str, Any], string_patterns: Dict[str, str],
+                           errors: List[str]) -> None:
+    """Report string fields that do not match their pattern."""
+    for field, pattern in string_patterns.items():
+        if field in data and isinstance(data[field], str):
+            if not _compile_pattern(pattern).match(data[field]):
+                errors.append(f"Field '{field}' does not match pattern {pattern}")
+
+
+# Custom rule section -> check, in the order checks are applied
+_RULE_CHECKS: Dict[str, Callable[[Dict[str, Any], Any, List[str]], None]] = {
+    'required_fields': _check_required_fields,
+    'field_types': _check_field_types,
+    'value_ranges': _check_value_ranges,
+    'string_patterns': _check_string_patterns,
+}
+
+# ValidationRule type -> check applied to its single field
+_SINGLE_RULE_CHECKS: Dict[str, Callable[[Dict[str, Any], Any, List[str]], None]] = {
+    'required_field': _check_required_fields,
+    'field_type': _check_field_types,
+    'value_range': _check_value_ranges,
+    'string_pattern': _check_string_patterns,
+}
+
 
 @dataclass
 class ValidationResult:
@@ -50,48 +127,17 @@ class ResponseValidator:
     
     def _validate_custom_rules(self, data: Dict[str, Any], rules: Dict[str, Any]) -> ValidationResult:
         """Apply custom validation rules."""
-        errors = []
-        warnings = []
-        
-        # Check required fields
-        required_fields = rules.get('required_fields', [])
-        for field in required_fields:
-            if field not in data:
-                errors.append(f"Required field '{field}' is missing")
-        
-        # Check field types
-        field_types = rules.get('field_types', {})
-        for field, expected_type in field_types.items():
-            if field in data:
-                actual_type = type(data[field]).__name__
-                if actual_type != expected_type:
-                    errors.append(f"Field '{field}' should be {expected_type}, got {actual_type}")
-        
-        # Check value ranges
-        value_ranges = rules.get('value_ranges', {})
-        for field, range_config in value_ranges.items():
-            if field in data:
-                value = data[field]
-                if isinstance(value, (int, float)):
-                    min_val = range_config.get('min')
-                    max_val = range_config.get('max')
-                    if min_val is not None and value < min_val:
-                        errors.append(f"Field '{field}' value {value} is below minimum {min_val}")
-                    if max_val is not None and value > max_val:
-                        errors.append(f"Field '{field}' value {value} is above maximum {max_val}")
+        errors: List[str] = []
         
-        # Check string patterns
-        string_patterns = rules.get('string_patterns', {})
-        for field, pattern in string_patterns.items():
-            if field in data and isinstance(data[field], str):
-                import re
-                if not re.match(pattern, data[field]):
-                    errors.append(f"Field '{field}' does not match pattern {pattern}")
+        for section, check in _RULE_CHECKS.items():
+            section_config = rules.get(section)
+            if section_config:
+                check(data, section_config, errors)
         
         return ValidationResult(
             valid=len(errors) == 0,
             errors=errors,
-            warnings=warnings
+            warnings=[]
         )
 
 
@@ -100,11 +146,22 @@ class SchemaValidator:
     
     def __init__(self):
         self.validator = jsonschema.Draft7Validator
+        # id(schema) -> (schema, validator); holding the schema keeps its id from being reused
+        self._validator_cache: Dict[int, Tuple[Dict[str, Any], Any]] = {}
+    
+    def _get_validator(self, schema: Dict[str, Any]) -> Any:
+        """Get the validator for a schema, building it on first use."""
+        cached = self._validator_cache.get(id(schema))
+        if cached is not None and cached[0] is schema:
+            return cached[1]
+        validator = self.validator(schema)
+        self._validator_cache[id(schema)] = (schema, validator)
+        return validator
     
     def validate_schema(self, data: Dict[str, Any], schema: Dict[str, Any]) -> ValidationResult:
         """Validate data against a JSON schema."""
         try:
-            validator = self.validator(schema)
+            validator = self._get_validator(schema)
             errors = []
             
             for error in validator.iter_errors(data):
@@ -231,17 +288,28 @@ class ValidationRule:
         self.name = name
         self.rule_type = rule_type
         self.config = config
+        
+        # Express the rule as a one-field section of the custom rules, built once
+        field_name = config.get('field_name')
+        self._check = _SINGLE_RULE_CHECKS.get(rule_type)
+        if rule_type == 'required_field':
+            self._check_config: Any = [field_name]
+        elif rule_type == 'field_type':
+            self._check_config = {field_name: config.get('expected_type')}
+        elif rule_type == 'value_range':
+            self._check_config = {field_name: config}
+        elif rule_type == 'string_pattern':
+            self._check_config = {field_name: config.get('pattern')}
+        else:
+            self._check_config = None
     
     def validate(self, data: Any) -> ValidationResult:
         """Apply the validation rule to data."""
-        if self.rule_type == 'required_field':
-            return self._validate_required_field(data)
-        elif self.rule_type == 'field_type':
-            return self._validate_field_type(data)
-        elif self.rule_type == 'value_range':
-            return self._validate_value_range(data)
-        elif self.rule_type == 'string_pattern':
-            return self._validate_string_pattern(data)
+        if self._check is not None:
+            errors: List[str] = []
+            if isinstance(data, dict):
+                self._check(data, self._check_config, errors)
+            return ValidationResult(valid=len(errors) == 0, errors=errors, warnings=[])
         elif self.rule_type == 'custom_function':
             return self._validate_custom_function(data)
         else:
@@ -251,75 +319,6 @@ class ValidationRule:
                 warnings=[]
             )
     
-    def _validate_required_field(self, data: Any) -> ValidationResult:
-        """Validate that a required field is present."""
-        field_name = self.config.get('field_name')
-        if isinstance(data, dict) and field_name not in data:
-            return ValidationResult(
-                valid=False,
-                errors=[f"Required field '{field_name}' is missing"],
-                warnings=[]
-            )
-        return ValidationResult(valid=True, errors=[], warnings=[])
-    
-    def _validate_field_type(self, data: Any) -> ValidationResult:
-        """Validate field type."""
-        field_name = self.config.get('field_name')
-        expected_type = self.config.get('expected_type')
-        
-        if isinstance(data, dict) and field_name in data:
-            actual_type = type(data[field_name]).__name__
-            if actual_type != expected_type:
-                return ValidationResult(
-                    valid=False,
-                    errors=[f"Field '{field_name}' should be {expected_type}, got {actual_type}"],
-                    warnings=[]
-                )
-        
-        return ValidationResult(valid=True, errors=[], warnings=[])
-    
-    def _validate_value_range(self, data: Any) -> ValidationResult:
-        """Validate value range."""
-        field_name = self.config.get('field_name')
-        min_val = self.config.get('min')
-        max_val = self.config.get('max')
-        
-        if isinstance(data, dict) and field_name in data:
-            value = data[field_name]
-            if isinstance(value, (int, float)):
-                if min_val is not None and value < min_val:
-                    return ValidationResult(
-                        valid=False,
-                        errors=[f"Field '{field_name}' value {value} is below minimum {min_val}"],
-                        warnings=[]
-                    )
-                if max_val is not None and value > max_val:
-                    return ValidationResult(
-                        valid=False,
-                        errors=[f"Field '{field_name}' value {value} is above maximum {max_val}"],
-                        warnings=[]
-                    )
-        
-        return ValidationResult(valid=True, errors=[], warnings=[])
-    
-    def _validate_string_pattern(self, data: Any) -> ValidationResult:
-        """Validate string pattern."""
-        field_name = self.config.get('field_name')
-        pattern = self.config.get('pattern')
-        
-        if isinstance(data, dict) and field_name in data:
-            value = data[field_name]
-            if isinstance(value, str):
-                import re
-                if not re.match(pattern, value):
-                    return ValidationResult(
-                        valid=False,
-                        errors=[f"Field '{field_name}' does not match pattern {pattern}"],
-                        warnings=[]
-                    )
-        
-        return ValidationResult(valid=True, errors=[], warnings=[])
-    
     def _validate_custom_function(self, data: Any) -> ValidationResult:
         """Validate using custom function."""
         # This would require dynamic function execution
@@ -2,9 +2,13 @@
 Basic tests for BATMAN API Testing Framework.
 """
 
+from pathlib import Path
+
 import pytest
+from jsonschema import Draft7Validator
 from api_testing_framework.config import ConfigManager
 from api_testing_framework.parser import OpenAPIParser
+from api_testing_framework import executor, templates, validation
 
 
 class TestConfigManager:
@@ -31,6 +35,75 @@ class TestConfigManager:
         assert "test_generation" in required_fields
         assert "execution" in required_fields
 
+    def test_config_schema_shared_between_instances(self):
+        """Test the configuration schema is built once and shared."""
+        assert ConfigManager().config_schema is ConfigManager().config_schema
+        Draft7Validator.check_schema(ConfigManager().config_schema)
+    
+    def test_process_env_variables(self, monkeypatch):
+        """Test ${VAR} references are substituted at any depth."""
+        monkeypatch.setenv("BATMAN_TEST_TOKEN", "secret")
+        config_manager = ConfigManager()
+        config = {
+            "target_api": {"headers": {"Authorization": "${BATMAN_TEST_TOKEN}"}},
+            "services": ["${BATMAN_TEST_TOKEN}", "api"],
+            "missing": "${BATMAN_TEST_UNSET_VAR}",
+            "plain": "Bearer ${BATMAN_TEST_TOKEN}",
+            "trailing": "${BATMAN_TEST_TOKEN}\n",
+        }
+        
+        result = config_manager._process_env_variables(config)
+        
+        assert result["target_api"]["headers"]["Authorization"] == "secret"
+        assert result["services"] == ["secret", "api"]
+        assert result["missing"] == "${BATMAN_TEST_UNSET_VAR}"
+        assert result["plain"] == "Bearer ${BATMAN_TEST_TOKEN}"
+        assert result["trailing"] == "${BATMAN_TEST_TOKEN}\n"
+    
+    def test_merge_into(self):
+        """Test environment overlays are merged recursively into the base."""
+        config_manager = ConfigManager()
+        base = {"target_api": {"base_url": "https://api.example.com", "timeout": 30}}
+        overlay = {"target_api": {"base_url": "http://localhost:5000"}, "docker": {"enabled": True}}
+        
+        config_manager._merge_into(base, overlay)
+        
+        assert base == {
+            "target_api": {"base_url": "http://localhost:5000", "timeout": 30},
+            "docker": {"enabled": True},
+        }
+    
+    def test_create_default_config(self, tmp_path):
+        """Test the default project configuration loads and validates."""
+        (tmp_path / "config" / "environments").mkdir(parents=True)
+        config_manager = ConfigManager()
+        config_manager.create_default_config(tmp_path)
+        
+        config_file = tmp_path / "config" / "test-config.yaml"
+        for env in ("local", "staging", "production"):
+            config = config_manager.load_config(str(config_file), env)
+            assert config_manager.validate_config(config)
+        
+        assert config["execution"]["read_only"] is True
+    
+    def test_load_config_cached(self, tmp_path, monkeypatch):
+        """Test the on-disk config cache returns the same result as a fresh load."""
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+        (tmp_path / "config" / "environments").mkdir(parents=True)
+        config_manager = ConfigManager()
+        config_manager.create_default_config(tmp_path)
+        config_file = str(tmp_path / "config" / "test-config.yaml")
+        
+        fresh = config_manager.load_config(config_file, "staging")
+        assert config_manager.load_config_cached(config_file, "staging") == fresh
+        assert list((tmp_path / "cache" / "batman").glob("*.pkl"))
+        assert config_manager.load_config_cached(config_file, "staging") == fresh
+        
+        # A cache entry that fails to unpickle is rebuilt rather than raised
+        for cache_file in (tmp_path / "cache" / "batman").glob("*.pkl"):
+            cache_file.write_bytes(b"cbatman_missing_module\nthing\n.")
+        assert config_manager.load_config_cached(config_file, "staging") == fresh
+
 
 class TestOpenAPIParser:
     """Test OpenAPI parsing functionality."""
@@ -56,6 +129,336 @@ class TestOpenAPIParser:
         # Test multiple parameters
         params = parser._extract_path_params("/users/{user_id}/posts/{post_id}")
         assert params == ["user_id", "post_id"]
+    
+    def test_resolve_refs(self):
+        """Test internal references are resolved without copying untouched subtrees."""
+        parser = OpenAPIParser()
+        user = {"type": "object"}
+        untouched = {"description": "No references here"}
+        spec = {
+            "components": {"schemas": {"User": user}},
+            "paths": {
+                "/users": {"get": {"responses": {
+                    "200": {"$ref": "#/components/schemas/User"},
+                    "404": untouched,
+                }}}
+            },
+        }
+        
+        resolved = parser.resolve_refs(spec)
+        
+        responses = resolved["paths"]["/users"]["get"]["responses"]
+        assert responses["200"] is user
+        assert responses["404"] is untouched
+        assert spec["paths"]["/users"]["get"]["responses"]["200"] == {"$ref": "#/components/schemas/User"}
+    
+    def test_spec_cache_round_trip(self, tmp_path):
+        """Test cached specs load unchanged and specs with non-string keys skip the cache."""
+        parser = OpenAPIParser()
+        cacheable = tmp_path / "cacheable.yaml"
+        cacheable.write_text("openapi: 3.0.0\npaths:\n  /users:\n    get:\n      responses:\n        '200': {}\n")
+        int_keys = tmp_path / "int_keys.yaml"
+        int_keys.write_text("openapi: 3.0.0\npaths:\n  /users:\n    get:\n      responses:\n        200: {}\n")
+        
+        fresh = parser._fetch_from_file(str(cacheable), cache=True)
+        assert (tmp_path / "cacheable.yaml.cache.json").exists()
+        assert parser._fetch_from_file(str(cacheable), cache=True) == fresh
+        
+        fresh = parser._fetch_from_file(str(int_keys), cache=True)
+        assert not (tmp_path / "int_keys.yaml.cache.json").exists()
+        assert parser._fetch_from_file(str(int_keys), cache=True) == fresh
+        assert 200 in fresh["paths"]["/users"]["get"]["responses"]
+    
+    def test_parse_all_matches_separate_passes(self):
+        """Test the single-pass parse agrees with the individual parse methods."""
+        parser = OpenAPIParser()
+        spec = {
+            "paths": {
+                "/users": {
+                    "get": {"responses": {"200": {"description": "OK"}, "404": {}}},
+                    "post": {"requestBody": {}, "responses": {"201": {}, "400": {}}},
+                    "parameters": [],
+                },
+            },
+            "components": {"schemas": {"User": {"type": "object", "required": ["id"]}}},
+        }
+        
+        endpoints, schemas, test_cases = parser.parse_all(spec)
+        
+        assert endpoints == parser.parse_endpoints(spec)
+        assert schemas == parser.extract_schemas(spec)
+        for endpoint in endpoints:
+            assert test_cases[(endpoint.method, endpoint.path)] == parser.get_endpoint_test_cases(endpoint)
+    
+    def test_integer_status_codes(self):
+        """Test responses keyed by integer status codes, as YAML loads them unquoted."""
+        parser = OpenAPIParser()
+        spec = {"paths": {"/users": {"get": {"responses": {200: {"description": "OK"}, 404: {}, 500: {}}}}}}
+        
+        endpoint = parser.parse_endpoints(spec)[0]
+        
+        assert [case["expected_status"] for case in parser.get_endpoint_test_cases(endpoint)] == [200, 404, 500]
+        assert endpoint.classify_responses() == {
+            "success": {200: {"description": "OK"}}, "client_error": {404: {}}, "server_error": {500: {}}
+        }
+
+
+class TestBatchedExecution:
+    """Test mapping of batched BATS runs back to test files."""
+    
+    def test_results_from_shard(self, tmp_path):
+        """Test TAP output is attributed to files by their @test count."""
+        first = tmp_path / "first.bats"
+        first.write_text('@test "one" {\n}\n@test "two" {\n}\n')
+        second = tmp_path / "second.bats"
+        second.write_text('@test "three" {\n}\n')
+        outcome = executor._ProcessOutcome(
+            key=[first, second],
+            returncode=1,
+            stdout="1..3\nok 1 one\nok 2 two\nnot ok 3 three\n# `false' failed\n",
+            stderr="",
+            duration=3.0,
+        )
+        
+        results = executor.TestExecutor()._results_from_shard([first, second], outcome)
+        
+        assert [r.success for r in results] == [True, False]
+        assert results[0].output == "ok 1 one\nok 2 two"
+        assert results[1].error_message == "not ok 3 three\n# `false' failed"
+        assert results[0].duration == 2.0
+    
+    @pytest.mark.skipif(not executor._ProcessReaper.supported, reason="requires POSIX pipes")
+    def test_large_output_keeps_tap_results(self, tmp_path):
+        """Test a chatty passing test does not lose the shard's TAP lines to the cap."""
+        first = tmp_path / "first.bats"
+        first.write_text('@test "chatty" {\n}\n')
+        second = tmp_path / "second.bats"
+        second.write_text('@test "quiet" {\n}\n')
+        script = "echo 1..2; echo ok 1 chatty; yes '# noise' | head -c 200000; echo ok 2 quiet"
+        reaper = executor._ProcessReaper(1, output_limit=1024,
+                                         keep_lines=executor._TAP_RESULT_RE)
+        
+        [outcome] = reaper.run([([first, second], ["sh", "-c", script], tmp_path, 30)])
+        results = executor.TestExecutor()._results_from_shard([first, second], outcome)
+        
+        assert len(outcome.stdout) < 2048
+        assert [r.success for r in results] == [True, True]
+
+
+class TestTestDiscovery:
+    """Test discovery of generated BATS files."""
+    
+    def test_find_test_files_no_duplicates(self, tmp_path):
+        """Test top-level and nested BATS files are each found once."""
+        (tmp_path / "nested").mkdir()
+        (tmp_path / "top.bats").write_text("")
+        (tmp_path / "nested" / "inner.bats").write_text("")
+        (tmp_path / "notes.txt").write_text("")
+        
+        found = executor.TestExecutor()._find_test_files(tmp_path)
+        
+        assert found == [tmp_path / "nested" / "inner.bats", tmp_path / "top.bats"]
+
+
+class TestResultCache:
+    """Test reuse of passing BATS results."""
+    
+    def test_uncached_files_are_staged(self, tmp_path, monkeypatch):
+        """Test cache_results with stage_tmpfs stages only the files not yet cached."""
+        test_file = tmp_path / "users.bats"
+        test_file.write_text('@test "one" {\n}\n')
+        test_executor = executor.TestExecutor()
+        staged = []
+        
+        def run_staged(output_dir, test_files, max_parallel, timeout, verbose):
+            staged.append(test_files)
+            return [executor.TestResult(test_file=str(f), success=True, output="ok 1 one",
+                                        duration=0.1, exit_code=0) for f in test_files]
+        
+        monkeypatch.setattr(test_executor, "_run_staged_tests", run_staged)
+        for _ in range(2):
+            results = test_executor._run_cached_tests(tmp_path, [test_file], True, True, 4, 30, False)
+            assert [result.test_file for result in results] == [str(test_file)]
+        
+        assert staged == [[test_file]]
+
+
+class TestTemplateEngine:
+    """Test template context helpers."""
+    
+    def test_generate_test_data_nested(self, tmp_path, monkeypatch):
+        """Test nested object schemas get their own freshly built test data."""
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        engine = templates.TemplateEngine()
+        schema = {"properties": {"name": {"type": "string"},
+                                 "owner": {"type": "object", "properties": {"id": {"type": "string"}}}}}
+        
+        first = engine._generate_test_data(schema)
+        first["owner"]["id"] = "changed"
+        second = engine._generate_test_data(schema)
+        
+        assert second == {"name": "Test Name", "owner": {"id": "test-id-123"}}
+
+
+@pytest.mark.skipif(not executor._ProcessReaper.supported, reason="requires POSIX pipes")
+class TestProcessReaper:
+    """Test the single-threaded child process reaper."""
+    
+    def test_collects_output_and_exit_code(self, tmp_path):
+        """Test stdout, stderr and the exit code of each child are reported."""
+        reaper = executor._ProcessReaper(2)
+        jobs = [
+            ("fails", ["sh", "-c", "echo out; echo err >&2; exit 3"], tmp_path, 30),
+            ("passes", ["sh", "-c", "echo ok"], tmp_path, 30),
+        ]
+        
+        outcomes = {outcome.key: outcome for outcome in reaper.run(jobs)}
+        
+        failed = outcomes["fails"]
+        assert (failed.returncode, failed.stdout, failed.stderr) == (3, "out\n", "err\n")
+        assert (outcomes["passes"].returncode, outcomes["passes"].stdout) == (0, "ok\n")
+        assert not any(outcome.timed_out for outcome in outcomes.values())
+    
+    def test_kills_child_on_timeout(self, tmp_path):
+        """Test a child running past its timeout is killed and reported as timed out."""
+        reaper = executor._ProcessReaper(1)
+        
+        [outcome] = reaper.run([("slow", ["sh", "-c", "echo started; sleep 30"], tmp_path, 0.5)])
+        
+        assert outcome.timed_out
+        assert outcome.duration < 10
+    
+    def test_output_larger_than_read_buffer(self, tmp_path):
+        """Test output spanning many reads into the shared scratch buffer arrives intact."""
+        reaper = executor._ProcessReaper(2)
+        size = executor._READ_CHUNK * 3 + 1
+        jobs = [
+            (char, ["sh", "-c", f"head -c {size} /dev/zero | tr '\\0' {char}"], tmp_path, 30)
+            for char in "ab"
+        ]
+        
+        outcomes = {outcome.key: outcome.stdout for outcome in reaper.run(jobs)}
+        
+        assert outcomes == {"a": "a" * size, "b": "b" * size}
+    
+    @pytest.mark.skipif(not executor._ProcessReaper.use_pidfd, reason="requires pidfd support")
+    def test_grandchild_holding_pipes(self, tmp_path):
+        """Test a child is reaped on exit even while a grandchild keeps its pipes open."""
+        reaper = executor._ProcessReaper(1)
+        
+        [outcome] = reaper.run([("forks", ["sh", "-c", "sleep 5 & echo hi"], tmp_path, 30)])
+        
+        assert (outcome.returncode, outcome.stdout) == (0, "hi\n")
+        assert outcome.duration < 3
+    
+    def test_threaded_fallback(self, tmp_path, monkeypatch):
+        """Test parallel runs fall back to worker threads where the reaper is unsupported."""
+        monkeypatch.setattr(executor._ProcessReaper, "supported", False)
+        monkeypatch.setattr(executor, "_bats_executable", lambda: "sh")
+        monkeypatch.setattr(executor.TestExecutor, "_check_bats_available", lambda self: True)
+        (tmp_path / "pass.bats").write_text("exit 0\n")
+        (tmp_path / "fail.bats").write_text("echo broken >&2; exit 1\n")
+        
+        results = executor.TestExecutor()._run_parallel_tests(
+            sorted(tmp_path.glob("*.bats")), 2, 30, False)
+        
+        outcomes = {Path(r.test_file).name: (r.success, r.error_message) for r in results}
+        assert outcomes == {"fail.bats": (False, "broken\n"), "pass.bats": (True, None)}
+
+
+class TestValidation:
+    """Test response and rule validation."""
+    
+    def test_passing_results_are_independent(self):
+        """Test changing one passing result does not leak into later ones."""
+        validator = validation.ResponseValidator()
+        rules = {"required_fields": ["id"]}
+        
+        first = validator.validate_response({"id": 1}, validation_rules=rules)
+        first.errors.append("noted by caller")
+        second = validator.validate_response({"id": 2}, validation_rules=rules)
+        
+        assert second.valid
+        assert second.errors == []
+        assert second.warnings == []
+    
+    def test_type_matches(self):
+        """Test type names are checked with isinstance, without treating bools as numbers."""
+        from collections import OrderedDict
+        
+        assert validation._type_matches(1, "int")
+        assert not validation._type_matches(True, "int")
+        assert not validation._type_matches(True, "float")
+        assert validation._type_matches(True, "bool")
+        assert not validation._type_matches(1.0, "int")
+        # Subclasses now match, so an OrderedDict is a 'dict'
+        assert validation._type_matches(OrderedDict(), "dict")
+        # Names outside the map still compare the exact type name
+        assert validation._type_matches(None, "NoneType")
+        assert not validation._type_matches(1, "integer")
+    
+    @pytest.mark.parametrize("rule_type, config, section, section_config, error", [
+        ("required_field", {"field_name": "id"}, "required_fields", ["id"],
+         "Required field 'id' is missing"),
+        ("field_type", {"field_name": "age", "expected_type": "int"}, "field_types", {"age": "int"},
+         "Field 'age' should be int, got str"),
+        ("value_range", {"field_name": "count", "min": 1, "max": 5}, "value_ranges",
+         {"count": {"min": 1, "max": 5}}, "Field 'count' value 9 is above maximum 5"),
+        ("string_pattern", {"field_name": "code", "pattern": "[A-Z]\\d"}, "string_patterns",
+         {"code": "[A-Z]\\d"}, "Field 'code' does not match pattern [A-Z]\\d"),
+    ])
+    def test_rule_types(self, rule_type, config, section, section_config, error):
+        """Test each rule type reports the same error as a rule and as a custom rule section."""
+        failing = {"age": "ten", "count": 9, "code": "a1"}
+        passing = {"id": 1, "age": 10, "count": 3, "code": "A1"}
+        rule = validation.ValidationRule(rule_type, rule_type, config)
+        validator = validation.ResponseValidator()
+        rules = {section: section_config}
+        
+        assert rule.validate(failing).errors == [error]
+        assert validator.validate_response(failing, validation_rules=rules).errors == [error]
+        assert rule.validate(passing).valid
+        assert validator.validate_response(passing, validation_rules=rules).valid
+    
+    def test_invalid_string_pattern_fails_on_validate(self):
+        """Test a bad pattern does not break rule construction, only validation."""
+        import re
+        
+        rule = validation.ValidationRule("code", "string_pattern", {"field_name": "code", "pattern": "("})
+        
+        with pytest.raises(re.error):
+            rule.validate({"code": "A1"})
+        with pytest.raises(re.error):
+            validation.ResponseValidator().validate_response(
+                {"code": "A1"}, validation_rules={"string_patterns": {"code": "("}})
+
+
+class TestReports:
+    """Test report generation."""
+    
+    def test_junit_report_escapes_error_message(self, tmp_path):
+        """Test failure messages with markup characters produce valid XML."""
+        import xml.etree.ElementTree as ET
+        
+        result = executor.TestResult(
+            test_file="/tests/users.bats",
+            success=False,
+            duration=0.5,
+            output="",
+            error_message='expected "200" < got 500 & body',
+            exit_code=1,
+        )
+        results = executor.ExecutionResults(
+            total_tests=1, passed_tests=0, failed_tests=1,
+            total_duration=0.5, results=[result], success=False,
+        )
+        
+        executor.TestExecutor()._generate_junit_report(results, tmp_path)
+        
+        suite = ET.parse(tmp_path / "test-report.xml").getroot()
+        failure = suite.find("testcase/failure")
+        assert suite.get("failures") == "1"
+        assert failure.get("message") == 'expected "200" < got 500 & body'
 
 
 if __name__ == "__main__":